@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import asyncio
+import psycopg
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database import db_connection_pool
+from Scripts.Database.db_connection_pool import create_connection_pool, connection, close_connection_pool, create_async_connection_pool, async_connection, async_pool_stats, close_async_connection_pool
+
+THREADS = 16
+POOL_SIZE = 4
+QUERIES_PER_THREAD = 200
+LOOKUP_QUERY = "SELECT app_id, game_name, price FROM games WHERE app_id = %s;"
+
+def sample_app_ids(count):
+    with connection() as conn:
+        return [row[0] for row in conn.execute("SELECT app_id FROM games ORDER BY random() LIMIT %s;", (count,)).fetchall()]
+
+def lookup_worker(app_ids):
+    for app_id in app_ids:
+        with connection() as conn:
+            conn.execute(LOOKUP_QUERY, (app_id,)).fetchone()
+
+def benchmark_threads(app_ids, threads = THREADS):
+    chunks = [app_ids[index::threads] for index in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as executor:
+        list(executor.map(lookup_worker, chunks))
+    return time.perf_counter() - start
+
+def benchmark_prepared(app_ids, prepare_threshold):
+    with psycopg.connect(**dict(db_connection_pool.connection_kwargs(), prepare_threshold = prepare_threshold)) as conn:
+        start = time.perf_counter()
+        for app_id in app_ids:
+            conn.execute(LOOKUP_QUERY, (app_id,)).fetchone()
+        return time.perf_counter() - start
+
+async def benchmark_async(app_ids, concurrency = THREADS):
+    await create_async_connection_pool(minconn = 1, maxconn = POOL_SIZE)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(app_id):
+        async with semaphore:
+            async with async_connection() as conn:
+                cursor = await conn.execute(LOOKUP_QUERY, (app_id,))
+                await cursor.fetchone()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(app_id) for app_id in app_ids))
+    elapsed = time.perf_counter() - start
+    stats = async_pool_stats()
+    await close_async_connection_pool()
+    return elapsed, stats
+
+def wait_summary(stats):
+    requests = stats.get("requests_num", 0)
+    return f"{requests} checkouts, {stats.get('requests_queued', 0)} queued, average wait {stats.get('requests_wait_ms', 0) / max(requests, 1):.2f} ms, {stats.get('connections_num', 0)} connections opened"
+
+def benchmark_connection_pool(threads = THREADS, queries_per_thread = QUERIES_PER_THREAD):
+    create_connection_pool(minconn = 1, maxconn = POOL_SIZE)
+    try:
+        app_ids = sample_app_ids(threads * queries_per_thread)
+        db_connection_pool.db_pool.pop_stats()
+
+        elapsed = benchmark_threads(app_ids, threads)
+        print(f"Thread pool: {len(app_ids) / elapsed:.0f} lookups/s with {threads} threads on {POOL_SIZE} connections ({wait_summary(db_connection_pool.db_pool.pop_stats())})")
+    finally:
+        close_connection_pool()
+
+    unprepared = benchmark_prepared(app_ids, None)
+    prepared = benchmark_prepared(app_ids, db_connection_pool.PREPARE_THRESHOLD)
+    print(f"Single connection: {unprepared / len(app_ids) * 1000:.3f} ms/lookup unprepared, {prepared / len(app_ids) * 1000:.3f} ms/lookup prepared")
+
+    elapsed, stats = asyncio.run(benchmark_async(app_ids, threads))
+    print(f"Async pool: {len(app_ids) / elapsed:.0f} lookups/s with {threads} tasks on {POOL_SIZE} connections ({wait_summary(stats)})")
+
+benchmark_connection_pool()
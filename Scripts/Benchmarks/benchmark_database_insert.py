@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.db_connection_pool import create_connection_pool, get_connection, return_connection, close_connection_pool
+from Scripts.Database.insert_data_to_database import insert_data_from_object, insert_data_bulk, VECTOR_SIZE, GAME_COLUMNS
+
+GAME_COUNT = 2000
+FIRST_APP_ID = 900000000
+
+def synthetic_game(app_id):
+    return {
+        'App ID': app_id,
+        'Game Name': f"Benchmark Game {app_id}",
+        'Type': "game",
+        'Developer': ["Benchmark Studio", None] if app_id % 3 == 0 else ["Benchmark Studio"],
+        'Publisher': ["Benchmark \"Quoted\" Publisher"],
+        'Is Free': app_id % 2 == 0,
+        'Price': 19.99,
+        'Age Rating': 0,
+        'Detailed Description': "A long description\twith tabs, \\backslashes\\ and\nnew lines. " * 20,
+        'Short Description': "A short description.",
+        'About the Game': "About the game. " * 20,
+        'Minimum Requirements': "Minimum: 4 GB RAM",
+        'Recommended Requirements': "Recommended: 8 GB RAM",
+        'Categories': [{"id": 2, "description": "Single-player"}],
+        'Tags': ["Action", "Indie"],
+        'Genres': [{"id": "1", "description": "Action"}],
+        'Recommendations': 1234,
+        'Release Date': "15 Apr, 2025",
+        'Features': [round(random.random(), 4) for _ in range(VECTOR_SIZE)],
+        'Detailed Description Vector': [round(random.uniform(-1, 1), 4) for _ in range(VECTOR_SIZE)],
+        'About the Game Vector': [round(random.uniform(-1, 1), 4) for _ in range(VECTOR_SIZE)],
+        'Short Description Vector': [round(random.uniform(-1, 1), 4) for _ in range(VECTOR_SIZE)],
+        'Metadata Vector': [round(random.uniform(-1, 1), 4) for _ in range(VECTOR_SIZE)]
+    }
+
+def delete_benchmark_games():
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM games WHERE app_id >= %s", (FIRST_APP_ID,))
+        connection.commit()
+    finally:
+        return_connection(connection)
+
+def count_benchmark_games():
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM games WHERE app_id >= %s", (FIRST_APP_ID,))
+            return cursor.fetchone()[0]
+    finally:
+        return_connection(connection)
+
+def fetch_benchmark_rows():
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(GAME_COLUMNS)} FROM games WHERE app_id >= %s ORDER BY app_id", (FIRST_APP_ID,))
+            return cursor.fetchall()
+    finally:
+        return_connection(connection)
+
+def benchmark_database_insert(game_count = GAME_COUNT):
+    create_connection_pool(minconn = 1, maxconn = 2)
+    games = [synthetic_game(FIRST_APP_ID + index) for index in range(game_count)]
+
+    try:
+        delete_benchmark_games()
+        start = time.perf_counter()
+        insert_data_from_object(games, silent = True)
+        row_time = time.perf_counter() - start
+        row_count = count_benchmark_games()
+        row_rows = fetch_benchmark_rows()
+        print(f"Row-at-a-time INSERT: {row_count} rows in {row_time:.2f}s ({row_count / row_time:.0f} rows/s)")
+
+        delete_benchmark_games()
+        start = time.perf_counter()
+        insert_data_bulk(games, silent = True)
+        bulk_time = time.perf_counter() - start
+        bulk_count = count_benchmark_games()
+        bulk_rows = fetch_benchmark_rows()
+        print(f"Bulk COPY + merge: {bulk_count} rows in {bulk_time:.2f}s ({bulk_count / bulk_time:.0f} rows/s)")
+        print(f"Speedup: {row_time / bulk_time:.1f}x")
+        mismatched = sum(row != bulk for row, bulk in zip(row_rows, bulk_rows)) + abs(len(row_rows) - len(bulk_rows))
+        print(f"COPY round trip: {mismatched} of {len(row_rows)} rows differ from the row-at-a-time INSERT")
+    finally:
+        delete_benchmark_games()
+        close_connection_pool()
+
+benchmark_database_insert()
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from mock_steam_server import start_mock_steam_server
+from Scripts.SteamApi.steam_fetch import get_app_details, get_steam_tags, iter_app_data
+
+APP_COUNT = 100
+SERIAL_SLEEP = 0.5
+CONCURRENCY = 16
+REQUESTS_PER_SECOND = 50.0
+
+def run_serial(app_ids, base_url, sleep = SERIAL_SLEEP):
+    start = time.perf_counter()
+    for app_id in app_ids:
+        details = get_app_details(app_id, base_url = base_url)
+        if details:
+            get_steam_tags(app_id, base_url = base_url)
+        time.sleep(sleep)
+    return time.perf_counter() - start
+
+async def run_async(app_ids, base_url, concurrency = CONCURRENCY, requests_per_second = REQUESTS_PER_SECOND):
+    start = time.perf_counter()
+    fetched = 0
+    async for app_id, details, tags in iter_app_data(app_ids, concurrency = concurrency, requests_per_second = requests_per_second, api_base_url = base_url, page_base_url = base_url):
+        fetched += 1 if details else 0
+    return time.perf_counter() - start, fetched
+
+def benchmark_fetch(app_count = APP_COUNT, latency = 0.15, error_rate = 0.0):
+    server, base_url = start_mock_steam_server(latency = latency, error_rate = error_rate)
+    app_ids = list(range(10, 10 + app_count))
+
+    try:
+        serial_time = run_serial(app_ids, base_url)
+        print(f"Serial loop: {app_count} apps in {serial_time:.2f}s ({app_count / serial_time:.2f} apps/s)")
+
+        async_time, fetched = asyncio.run(run_async(app_ids, base_url))
+        print(f"Async engine: {fetched}/{app_count} apps in {async_time:.2f}s ({app_count / async_time:.2f} apps/s)")
+        print(f"Speedup: {serial_time / async_time:.1f}x")
+    finally:
+        server.shutdown()
+
+benchmark_fetch()
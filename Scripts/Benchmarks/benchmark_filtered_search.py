@@ -0,0 +1,90 @@
+import os
+import re
+import sys
+import time
+import random
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.db_connection_pool import create_connection_pool, get_connection, return_connection, close_connection_pool
+from Scripts.Recommendation.vector_search import knn_search, filtered_exact_search, search_conditions, vector_literal, set_ef_search, EF_SEARCH
+from psycopg import sql
+
+QUERY_COUNT = 30
+K = 10
+COLUMN = "short_description_vector"
+QUERY_NOISE = 0.05
+FILTER_SETS = [
+    {},
+    {"is_free": True},
+    {"max_price": 10},
+    {"tags": ["RPG"]},
+    {"genres": ["Strategy"], "max_price": 20},
+    {"released_after": date(2024, 1, 1)},
+    {"tags": ["RPG"], "is_free": True, "released_after": date(2020, 1, 1)}
+]
+
+def sample_query_vectors(cursor, column, count):
+    cursor.execute(f"SELECT {column}::text FROM games WHERE {column} IS NOT NULL ORDER BY random() LIMIT %s;", (count,))
+    queries = []
+    for (text,) in cursor.fetchall():
+        vector = [float(x) for x in text.strip("[]").split(",")]
+        queries.append([x + random.gauss(0, QUERY_NOISE) for x in vector])
+    return queries
+
+def post_filtered_count(cursor, query, filters, k):
+    set_ef_search(cursor, EF_SEARCH)
+    where, params = search_conditions(COLUMN, filters)
+    cursor.execute(sql.SQL("""
+        SELECT count(*) FROM (
+            SELECT * FROM games WHERE {column} IS NOT NULL ORDER BY {column} <=> %(query)s::vector LIMIT %(k)s
+        ) AS nearest WHERE {where};
+    """).format(column = sql.Identifier(COLUMN), where = where), dict(params, query = vector_literal(query), k = k))
+    return cursor.fetchone()[0]
+
+def plan_indexes(cursor, query, filters, k):
+    set_ef_search(cursor, EF_SEARCH)
+    where, params = search_conditions(COLUMN, filters)
+    cursor.execute(sql.SQL("""
+        EXPLAIN SELECT app_id FROM games WHERE {where} ORDER BY {column} <=> %(query)s::vector LIMIT %(k)s;
+    """).format(column = sql.Identifier(COLUMN), where = where), dict(params, query = vector_literal(query), k = k))
+    plan = "\n".join(row[0] for row in cursor.fetchall())
+    return sorted(set(re.findall(r"(?:using|on) (games_\w+)", plan))) or ["seq scan"]
+
+def benchmark_filtered_search(query_count = QUERY_COUNT, k = K):
+    create_connection_pool(minconn = 1, maxconn = 1)
+    connection = get_connection()
+
+    try:
+        with connection.cursor() as cursor:
+            queries = sample_query_vectors(cursor, COLUMN, query_count)
+            connection.commit()
+
+            for filters in FILTER_SETS:
+                recall = 0.0
+                filtered_time = 0.0
+                exact_time = 0.0
+                post_filtered = 0
+                for query in queries:
+                    start = time.perf_counter()
+                    expected = {app_id for app_id, _ in filtered_exact_search(cursor, COLUMN, query, k, filters)}
+                    exact_time += time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    result = {app_id for app_id, _ in knn_search(cursor, COLUMN, query, k, filters = filters)}
+                    filtered_time += time.perf_counter() - start
+                    connection.commit()
+
+                    recall += len(expected & result) / max(1, len(expected))
+                    post_filtered += post_filtered_count(cursor, query, filters, k)
+                    connection.commit()
+
+                indexes = plan_indexes(cursor, queries[0], filters, k)
+                connection.commit()
+                print(f"{str(filters):<80} recall@{k}={recall / len(queries):.3f}  filtered={filtered_time / len(queries) * 1000:.2f} ms  exact={exact_time / len(queries) * 1000:.2f} ms  post-filter keeps {post_filtered / len(queries):.1f}/{k}  plan: {', '.join(indexes)}")
+    finally:
+        return_connection(connection)
+        close_connection_pool()
+
+benchmark_filtered_search()
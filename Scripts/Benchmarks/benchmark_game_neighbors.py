@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import random
+import numpy as np
+from psycopg import sql
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.db_connection_pool import create_connection_pool, get_connection, return_connection, close_connection_pool
+from Scripts.Database.vector_adapter import register_vector_loader
+from Scripts.Recommendation.vector_search import knn_search, EF_SEARCH
+from Scripts.Recommendation.recommend_games import recommend_similar_games
+from Scripts.Recommendation.game_neighbors import NEIGHBOR_COLUMNS, NEIGHBORS_PER_COLUMN, load_column_vectors, update_game_neighbors, NEIGHBOR_ROWS_QUERY
+
+SAMPLE_SIZE = 300
+QUERY_COUNT = 200
+INSERTED_COUNTS = [20, 200]
+K = 10
+
+def stored_neighbors(cursor, column, app_ids):
+    cursor.execute("SELECT app_id, neighbor_app_id FROM game_neighbors WHERE vector_column = %s AND app_id = ANY(%s) ORDER BY app_id, rank;", (column, list(app_ids)))
+    neighbors = {}
+    for app_id, neighbor_app_id in cursor.fetchall():
+        neighbors.setdefault(app_id, []).append(neighbor_app_id)
+    return neighbors
+
+def neighbor_recall(cursor, column, sample_size = SAMPLE_SIZE, k = NEIGHBORS_PER_COLUMN):
+    app_ids, matrix = load_column_vectors(cursor, column)
+    rows = np.random.default_rng(0).choice(len(app_ids), sample_size, replace = False)
+    scores = matrix[rows] @ matrix.T
+    scores[np.arange(sample_size), rows] = -np.inf
+    exact = np.argsort(-scores, axis = 1)[:, :k]
+    stored = stored_neighbors(cursor, column, app_ids[rows].tolist())
+    hits = sum(len(set(app_ids[exact[index]].tolist()) & set(stored.get(int(app_ids[row]), []))) for index, row in enumerate(rows))
+    return hits / (sample_size * k)
+
+def knn_similar_games(cursor, app_id, k = K):
+    cursor.execute(f"SELECT {', '.join(NEIGHBOR_COLUMNS)} FROM games WHERE app_id = %s;", (app_id,))
+    vectors = cursor.fetchone()
+    results = {}
+    for column, vector in zip(NEIGHBOR_COLUMNS, vectors):
+        if vector is not None:
+            results[column] = [found for found, _ in knn_search(cursor, column, vector, k + 1, EF_SEARCH) if found != app_id][:k]
+    return results
+
+def benchmark_game_neighbors():
+    create_connection_pool(minconn = 1, maxconn = 2)
+    connection = get_connection()
+    register_vector_loader(connection)
+
+    try:
+        with connection.cursor(binary = True) as cursor:
+            for column in NEIGHBOR_COLUMNS:
+                print(f"{column}: routed neighbour recall@{NEIGHBORS_PER_COLUMN} vs exact = {neighbor_recall(cursor, column):.3f}")
+            connection.commit()
+
+            cursor.execute("SELECT DISTINCT app_id FROM game_neighbors;")
+            app_ids = random.Random(1).sample([row[0] for row in cursor.fetchall()], QUERY_COUNT)
+            connection.commit()
+
+            start = time.perf_counter()
+            for app_id in app_ids:
+                knn_similar_games(cursor, app_id)
+                connection.commit()
+            knn_time = (time.perf_counter() - start) / len(app_ids)
+
+        start = time.perf_counter()
+        for app_id in app_ids:
+            recommend_similar_games(app_id, K)
+        lookup_time = (time.perf_counter() - start) / len(app_ids)
+        print(f"'Similar to' per query: {len(NEIGHBOR_COLUMNS)} HNSW searches {knn_time * 1000:.2f} ms, neighbour lookup {lookup_time * 1000:.2f} ms ({knn_time / lookup_time:.1f}x)")
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql.SQL("EXPLAIN (ANALYZE, FORMAT JSON) " + NEIGHBOR_ROWS_QUERY).format(where = sql.SQL("TRUE")), {"app_id": app_ids[0], "columns": NEIGHBOR_COLUMNS})
+            plan = cursor.fetchone()[0][0]
+        connection.commit()
+        print(f"Neighbour lookup server execution time: {plan['Execution Time']:.3f} ms")
+
+        for count in INSERTED_COUNTS:
+            inserted = app_ids[:count]
+            with connection.cursor() as cursor:
+                before = {column: stored_neighbors(cursor, column, inserted) for column in NEIGHBOR_COLUMNS}
+                cursor.execute("DELETE FROM game_neighbors WHERE app_id = ANY(%s);", (inserted,))
+                cursor.execute("DELETE FROM game_clusters WHERE app_id = ANY(%s);", (inserted,))
+            connection.commit()
+
+            start = time.perf_counter()
+            update_game_neighbors(inserted)
+            update_time = time.perf_counter() - start
+
+            with connection.cursor() as cursor:
+                after = {column: stored_neighbors(cursor, column, inserted) for column in NEIGHBOR_COLUMNS}
+            connection.commit()
+            overlap = np.mean([
+                len(set(before[column].get(app_id, [])) & set(after[column].get(app_id, []))) / NEIGHBORS_PER_COLUMN
+                for column in NEIGHBOR_COLUMNS for app_id in inserted
+            ])
+            print(f"Incremental update of {len(inserted)} games: {update_time:.2f} s, neighbour overlap with full rebuild = {overlap:.3f}")
+    finally:
+        return_connection(connection)
+        close_connection_pool()
+
+benchmark_game_neighbors()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from langdetect import detect
+from mock_steam_server import build_app_details
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+from Scripts.SteamApi.language_filter import LanguageFilter, LANGUAGE_BACKEND
+
+SYNTHETIC_GAMES = 100
+
+FOREIGN_TEXTS = [
+    "Gra akcji, w której eksplorujesz ogromny świat, walczysz z przeciwnikami i odkrywasz tajemnice starożytnej cywilizacji.",
+    "Ein Actionspiel, in dem du eine riesige Welt erkundest, gegen Feinde kämpfst und die Geheimnisse einer alten Zivilisation entdeckst.",
+    "Экшен-игра, в которой вы исследуете огромный мир, сражаетесь с врагами и раскрываете тайны древней цивилизации.",
+    "一款动作游戏，你将探索一个巨大的世界，与敌人战斗，并揭开古老文明的秘密。",
+    "広大な世界を探索し、敵と戦い、古代文明の秘密を解き明かすアクションゲームです。",
+    "Un juego de acción en el que exploras un mundo enorme, luchas contra enemigos y descubres los secretos de una civilización antigua."
+]
+
+def legacy_is_english(text):
+    try:
+        return detect(text) == 'en'
+    except Exception:
+        return False
+
+def legacy_is_english_game(details):
+    return legacy_is_english(details.get('detailed_description', '')) or legacy_is_english(details.get('short_description', '')) or legacy_is_english(details.get('about_the_game', '')) or legacy_is_english(details.get('name', ''))
+
+def build_corpus(count = SYNTHETIC_GAMES):
+    rng = random.Random(0)
+    games = []
+    for app_id in range(10, 10 + count):
+        details = build_app_details(app_id)[str(app_id)]["data"]
+        if app_id % 3 == 0:
+            text = rng.choice(FOREIGN_TEXTS)
+            details["name"] = f"Gra {app_id}"
+            details["short_description"] = text
+            details["about_the_game"] = "<p>" + text * 3 + "</p>"
+            details["detailed_description"] = "<h1>" + text + "</h1>" + ("<p>" + text + "</p>") * 20
+        else:
+            details["detailed_description"] = details["detailed_description"] * 30
+        games.append(details)
+
+    for part_file in list_part_files(DATA_DIR):
+        for game in iter_part_records(part_file):
+            games.append({
+                "name": game.get("Game Name", ""),
+                "short_description": game.get("Short Description", ""),
+                "about_the_game": game.get("About the Game", ""),
+                "detailed_description": game.get("Detailed Description", "")
+            })
+    return games
+
+def benchmark_language_filter(backend = LANGUAGE_BACKEND):
+    games = build_corpus()
+
+    start = time.perf_counter()
+    legacy = [legacy_is_english_game(game) for game in games]
+    legacy_time = (time.perf_counter() - start) / len(games)
+
+    language_filter = LanguageFilter(backend)
+    start = time.perf_counter()
+    current = [language_filter.is_english_game(game) for game in games]
+    current_time = (time.perf_counter() - start) / len(games)
+
+    agreement = sum(1 for a, b in zip(legacy, current) if a == b)
+    print(f"Corpus: {len(games)} games ({sum(legacy)} accepted by the legacy gate)")
+    print(f"Legacy gate: {legacy_time * 1000:.2f} ms/game")
+    print(f"Language filter ({language_filter.backend_name}): {current_time * 1000:.2f} ms/game, saving {(legacy_time - current_time) * 1000:.2f} ms/game ({legacy_time / current_time:.0f}x)")
+    print(f"Decisions identical: {agreement}/{len(games)}")
+    print(f"Filter stats: {language_filter.stats()}")
+
+benchmark_language_filter()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.db_connection_pool import create_connection_pool, get_connection, return_connection, close_connection_pool
+from Scripts.Recommendation.vector_search import knn_search, SEARCH_COLUMNS, EF_SEARCH
+
+QUERY_COUNT = 50
+K = 10
+EF_SEARCH_VALUES = [10, 20, 40, 80, 160, 320]
+QUERY_NOISE = 0.05
+
+def sample_query_vectors(cursor, column, count):
+    cursor.execute(f"SELECT {column}::text FROM games WHERE {column} IS NOT NULL ORDER BY random() LIMIT %s;", (count,))
+    queries = []
+    for (text,) in cursor.fetchall():
+        vector = [float(x) for x in text.strip("[]").split(",")]
+        queries.append([x + random.gauss(0, QUERY_NOISE) for x in vector])
+    return queries
+
+def timed_search(cursor, column, query, k, ef_search = EF_SEARCH, exact = False):
+    start = time.perf_counter()
+    rows = knn_search(cursor, column, query, k, ef_search, exact = exact)
+    return [app_id for app_id, _ in rows], (time.perf_counter() - start) * 1000
+
+def benchmark_recommendation(query_count = QUERY_COUNT, k = K):
+    create_connection_pool(minconn = 1, maxconn = 1)
+    connection = get_connection()
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM games;")
+            print(f"Games in table: {cursor.fetchone()[0]}")
+
+            for column in SEARCH_COLUMNS:
+                queries = sample_query_vectors(cursor, column, query_count)
+                exact_results = []
+                exact_time = 0.0
+                for query in queries:
+                    result, elapsed = timed_search(cursor, column, query, k, exact = True)
+                    exact_results.append(set(result))
+                    exact_time += elapsed
+                connection.commit()
+                print(f"\n{column}: exact search {exact_time / len(queries):.2f} ms/query")
+
+                for ef_search in EF_SEARCH_VALUES:
+                    recall = 0.0
+                    total_time = 0.0
+                    for query, expected in zip(queries, exact_results):
+                        result, elapsed = timed_search(cursor, column, query, k, ef_search)
+                        recall += len(expected & set(result)) / max(1, len(expected))
+                        total_time += elapsed
+                    connection.commit()
+                    print(f"  ef_search={ef_search:<4} recall@{k}={recall / len(queries):.3f}  latency={total_time / len(queries):.2f} ms/query")
+    finally:
+        return_connection(connection)
+        close_connection_pool()
+
+benchmark_recommendation()
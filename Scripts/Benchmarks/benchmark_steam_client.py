@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from mock_steam_server import start_mock_steam_server
+from Scripts.SteamApi.steam_client import SteamClient
+from Scripts.SteamApi.steam_fetch import app_details_url
+
+REQUEST_COUNT = 300
+
+def run_plain(urls):
+    start = time.perf_counter()
+    for url in urls:
+        requests.get(url).json()
+    return time.perf_counter() - start
+
+def run_client(client, urls):
+    start = time.perf_counter()
+    for url in urls:
+        client.get(url, "appdetails").json()
+    return time.perf_counter() - start
+
+def benchmark_steam_client(request_count = REQUEST_COUNT, latency = 0.0, error_rate = 0.0):
+    server, base_url = start_mock_steam_server(latency = latency, error_rate = error_rate)
+    cache_dir = tempfile.mkdtemp()
+    client = SteamClient(cache_dir = cache_dir)
+    urls = [app_details_url(app_id, base_url) for app_id in range(10, 10 + request_count)]
+
+    try:
+        plain_time = run_plain(urls)
+        print(f"requests.get per call: {request_count} requests in {plain_time:.2f}s ({plain_time / request_count * 1000:.2f} ms/request)")
+
+        client_time = run_client(client, urls)
+        print(f"Pooled session: {request_count} requests in {client_time:.2f}s ({client_time / request_count * 1000:.2f} ms/request)")
+        print(f"Speedup: {plain_time / client_time:.1f}x")
+
+        app_list_url = f"{base_url}/ISteamApps/GetAppList/v2/"
+        first = client.get(app_list_url, "app_list", conditional = True)
+        second = client.get(app_list_url, "app_list", conditional = True)
+        print(f"App list revalidation: first {first.status_code} ({len(first.content)} bytes), second served from cache: {second.json() == first.json()}")
+        print(f"Client stats: {client.stats()}")
+    finally:
+        client.close()
+        shutil.rmtree(cache_dir)
+        server.shutdown()
+
+benchmark_steam_client()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+from glob import glob
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from mock_steam_server import build_store_page
+from Scripts.SteamApi.steam_fetch import parse_steam_tags, parse_steam_tags_full, finish_steam_tags, TagBlockReader, STREAM_CHUNK_SIZE
+
+STORE_PAGE_CORPUS_DIR = "Data/StorePages"
+GENERATED_PAGES = 50
+ROUNDS = 3
+
+def load_corpus(directory = STORE_PAGE_CORPUS_DIR):
+    pages = []
+    for path in sorted(glob(os.path.join(directory, "*.html"))):
+        with open(path, "r", encoding = "utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+def generated_corpus(count = GENERATED_PAGES):
+    pages = [build_store_page(app_id) for app_id in range(10, 10 + count)]
+    pages.append(build_store_page(1).replace("Adventure", "Rock &amp; Roll"))
+    pages.append(build_store_page(2).replace('class="glance_tags popular_tags"', 'class="glance_tags"'))
+    pages.append(build_store_page(3).replace('<div class="app_tag add_button"', '<span>Hidden</span><div class="app_tag add_button"'))
+    pages.append("<html><body><div class=\"age_gate\">Please enter your birth date</div></body></html>")
+    return pages
+
+def stream_page(page):
+    data = page.encode("utf-8")
+    reader = TagBlockReader("utf-8")
+    read = 0
+    for start in range(0, len(data), STREAM_CHUNK_SIZE):
+        chunk = data[start:start + STREAM_CHUNK_SIZE]
+        read += len(chunk)
+        if reader.feed(chunk):
+            break
+    return reader.result(), read, len(data)
+
+def time_parser(parser, pages, rounds = ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            parser(page)
+    return (time.perf_counter() - start) / (rounds * len(pages))
+
+def benchmark_tag_extraction():
+    pages = load_corpus() or generated_corpus()
+    print(f"Corpus: {len(pages)} store pages")
+
+    mismatches = 0
+    bytes_read = 0
+    bytes_total = 0
+    for page in pages:
+        expected = finish_steam_tags(parse_steam_tags_full(page))
+        streamed, read, total = stream_page(page)
+        bytes_read += read
+        bytes_total += total
+        if parse_steam_tags(page) != expected or streamed != expected:
+            mismatches += 1
+
+    full_time = time_parser(lambda page: finish_steam_tags(parse_steam_tags_full(page)), pages)
+    fast_time = time_parser(parse_steam_tags, pages)
+    print(f"BeautifulSoup html.parser: {full_time * 1000:.2f} ms/page")
+    print(f"Tag block scanner: {fast_time * 1000:.3f} ms/page ({full_time / fast_time:.0f}x faster)")
+    print(f"Streaming reader consumed {bytes_read / bytes_total:.0%} of page bytes")
+    print(f"Identical output: {len(pages) - mismatches}/{len(pages)}")
+
+benchmark_tag_extraction()
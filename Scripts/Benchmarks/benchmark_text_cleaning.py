@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from mock_steam_server import build_app_details
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+from Scripts.SteamApi.text_cleaning import remove_html_tags, clean_game_text, TEXT_FIELDS
+
+ROUNDS = 5
+SYNTHETIC_GAMES = 200
+
+def legacy_remove_html_tags(text):
+    clean = re.compile('<.*?>')
+    text_without_html = re.sub(clean, ' ', text)
+
+    patterns_to_remove = [r'&quot;', r'!-&quot;', r'\?&quot;', r'!-&quot;', r'&amp;', r'&gt;', r'&lt;']
+    for pattern in patterns_to_remove:
+        text_without_html = re.sub(pattern, '', text_without_html)
+
+    return re.sub(r'\s+', ' ', text_without_html).strip()
+
+def legacy_clean_json_data(json_data):
+    if isinstance(json_data, dict):
+        return {key: legacy_clean_json_data(value) for key, value in json_data.items()}
+    elif isinstance(json_data, list):
+        return [legacy_clean_json_data(item) for item in json_data]
+    elif isinstance(json_data, str):
+        return legacy_remove_html_tags(json_data)
+    else:
+        return json_data
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "plain text without markup",
+    "Tabs\tand\nnew lines\r\n  everywhere ",
+    "<p>Tag</p><br/><img src=\"a.png\">text",
+    "Rock &amp; Roll &quot;quoted&quot; &lt;b&gt; !-&quot;x ?&quot;y",
+    "a < b and c > d",
+    "<unterminated tag",
+    "multi\nline <a\nhref='x'> tag",
+    "Unicode non breaking　spaces",
+    "&nbsp;&eacute; stay untouched",
+]
+
+def synthetic_description(rng):
+    paragraphs = []
+    for _ in range(rng.randint(5, 40)):
+        words = " ".join(rng.choice(["explore", "fight", "craft", "&quot;epic&quot;", "world", "&amp;", "<b>bold</b>", "\n", "  "]) for _ in range(rng.randint(20, 80)))
+        paragraphs.append(f'<p class="bb_paragraph">{words}</p><br><img src="https://cdn.steam/{rng.random()}.gif">')
+    return "".join(paragraphs)
+
+def build_corpus(count = SYNTHETIC_GAMES):
+    rng = random.Random(0)
+    games = []
+    for app_id in range(10, 10 + count):
+        details = build_app_details(app_id)[str(app_id)]["data"]
+        details["detailed_description"] = synthetic_description(rng)
+        details["about_the_game"] = synthetic_description(rng)
+        requirements = details.get("pc_requirements") or {}
+        games.append({
+            "App ID": app_id,
+            "Game Name": details.get("name"),
+            "Detailed Description": details["detailed_description"],
+            "Short Description": details.get("short_description"),
+            "About the Game": details["about_the_game"],
+            "Minimum Requirements": requirements.get("minimum") if isinstance(requirements, dict) else None,
+            "Recommended Requirements": requirements.get("recommended") if isinstance(requirements, dict) else None,
+            "Categories": details.get("categories", []),
+            "Genres": details.get("genres", [])
+        })
+
+    for part_file in list_part_files(DATA_DIR):
+        games.extend(iter_part_records(part_file))
+    return games
+
+def time_cleaner(cleaner, games, rounds = ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cleaner(games)
+    return (time.perf_counter() - start) / (rounds * len(games))
+
+def benchmark_text_cleaning():
+    games = build_corpus()
+    edge_mismatches = [text for text in EDGE_CASES if remove_html_tags(text) != legacy_remove_html_tags(text)]
+    game_mismatches = sum(
+        1 for game in games
+        if any(clean_game_text(dict(game)).get(field) != legacy_clean_json_data(game.get(field)) for field in TEXT_FIELDS)
+    )
+
+    legacy_time = time_cleaner(lambda batch: [legacy_clean_json_data(game) for game in batch], games)
+    new_time = time_cleaner(lambda batch: [clean_game_text(dict(game)) for game in batch], games)
+
+    print(f"Corpus: {len(games)} games, {len(EDGE_CASES)} edge cases")
+    print(f"Legacy cleaner: {legacy_time * 1e6:.1f} us/game")
+    print(f"Text-field cleaner: {new_time * 1e6:.1f} us/game ({legacy_time / new_time:.1f}x faster)")
+    print(f"Golden output identical: games {len(games) - game_mismatches}/{len(games)}, edge cases {len(EDGE_CASES) - len(edge_mismatches)}/{len(EDGE_CASES)}")
+    for text in edge_mismatches:
+        print(f"  mismatch: {text!r} -> {remove_html_tags(text)!r} vs {legacy_remove_html_tags(text)!r}")
+
+benchmark_text_cleaning()
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.vector_adapter import to_vector_array, vector_text
+
+VECTOR_SIZE = 768
+GAMES = 500
+TEXT_VECTORS_PER_GAME = 4
+
+def legacy_round_vector(vector, precision = 4, target_length = VECTOR_SIZE):
+    rounded = [round(x, precision) for x in vector]
+    if len(rounded) > target_length:
+        return rounded[:target_length]
+    elif len(rounded) < target_length:
+        return rounded + [0.0] * (target_length - len(rounded))
+    return rounded
+
+def legacy_normalize_vector(vector, size = VECTOR_SIZE):
+    if not isinstance(vector, list):
+        return [0.0] * size
+    vector = [float(x) for x in vector]
+    if len(vector) > size:
+        return vector[:size]
+    return vector + [0.0] * (size - len(vector))
+
+def legacy_copy_vector_value(vector):
+    return "[" + ",".join(str(x) for x in legacy_normalize_vector(vector, VECTOR_SIZE)) + "]"
+
+def legacy_game(encoded, feature_columns):
+    vectors = [legacy_round_vector(row.tolist()) for row in encoded]
+    features = [0.0] * VECTOR_SIZE
+    for column in feature_columns:
+        features[column] = 1.0
+    return [legacy_copy_vector_value(vector) for vector in [features] + vectors]
+
+def array_game(encoded, feature_columns):
+    vectors = np.zeros((len(encoded), VECTOR_SIZE), dtype = np.float32)
+    vectors[:] = np.round(encoded.astype(np.float64), 4)
+    features = np.zeros(VECTOR_SIZE, dtype = np.float32)
+    features[feature_columns] = 1.0
+    return [vector_text(to_vector_array(vector)) for vector in [features] + list(vectors)]
+
+def parse_vector_text(text):
+    return np.array([float(x) for x in text[1:-1].split(",")], dtype = np.float32)
+
+def benchmark_vector_path(games = GAMES):
+    rng = np.random.default_rng(0)
+    encoded = [rng.normal(0, 0.05, (TEXT_VECTORS_PER_GAME, VECTOR_SIZE)).astype(np.float32) for _ in range(games)]
+    columns = [sorted(rng.choice(700, 12, replace = False).tolist()) for _ in range(games)]
+
+    start = time.perf_counter()
+    legacy_rows = [legacy_game(vectors, feature_columns) for vectors, feature_columns in zip(encoded, columns)]
+    legacy_time = (time.perf_counter() - start) / games
+
+    start = time.perf_counter()
+    array_rows = [array_game(vectors, feature_columns) for vectors, feature_columns in zip(encoded, columns)]
+    array_time = (time.perf_counter() - start) / games
+
+    identical = all(
+        np.array_equal(parse_vector_text(legacy), parse_vector_text(current))
+        for legacy_row, array_row in zip(legacy_rows, array_rows)
+        for legacy, current in zip(legacy_row, array_row)
+    )
+    legacy_bytes = sum(len(text) for row in legacy_rows for text in row) / games
+    array_bytes = sum(len(text) for row in array_rows for text in row) / games
+
+    print(f"Legacy list path: {legacy_time * 1000:.2f} ms/game ({legacy_bytes / 1024:.1f} KB of vector text)")
+    print(f"NumPy array path: {array_time * 1000:.2f} ms/game ({array_bytes / 1024:.1f} KB of vector text)")
+    print(f"Speedup: {legacy_time / array_time:.1f}x, float32 values identical after parsing: {identical}")
+
+benchmark_vector_path()
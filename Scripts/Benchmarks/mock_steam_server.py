@@ -0,0 +1,109 @@
+import json
+import time
+import random
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STORE_PAGE_TEMPLATE = """<html><head><title>{name} on Steam</title></head><body>
+<div class="page_content">{padding}</div>
+<div class="glance_tags popular_tags" data-appid="{app_id}">
+{tags}<div class="app_tag add_button" onclick="ShowAppTagModal( {app_id} )">+</div>
+</div>
+<div class="game_area_description">{padding}</div>
+</body></html>"""
+
+def build_app_details(app_id):
+    return {
+        str(app_id): {
+            "success": True,
+            "data": {
+                "type": "game",
+                "name": f"Mock Game {app_id}",
+                "steam_appid": app_id,
+                "required_age": 0,
+                "is_free": app_id % 5 == 0,
+                "detailed_description": f"<h1>Mock Game {app_id}</h1><p>An action packed adventure where you explore a vast world and fight enemies.</p>",
+                "about_the_game": f"<p>Explore the world of Mock Game {app_id} and discover its secrets.</p>",
+                "short_description": f"Mock Game {app_id} is an adventure game about exploring the world.",
+                "developers": ["Mock Studio"],
+                "publishers": ["Mock Publisher"],
+                "price_overview": {"final_formatted": "19,99zł"},
+                "pc_requirements": {"minimum": "<strong>Minimum:</strong> 4 GB RAM", "recommended": "<strong>Recommended:</strong> 8 GB RAM"},
+                "categories": [{"id": 2, "description": "Single-player"}],
+                "genres": [{"id": "1", "description": "Action"}, {"id": "25", "description": "Adventure"}],
+                "recommendations": {"total": app_id % 1000},
+                "release_date": {"coming_soon": False, "date": "15 Apr, 2025"}
+            }
+        }
+    }
+
+def build_store_page(app_id, padding_size = 200000):
+    tags = "".join(
+        f'<a href="https://store.steampowered.com/tags/en/{tag}/" class="app_tag" style="display: none;">\n\t\t\t{tag}\t\t\t</a>\n'
+        for tag in ["Action", "Adventure", "Indie", "Singleplayer", "Exploration"]
+    )
+    return STORE_PAGE_TEMPLATE.format(name = f"Mock Game {app_id}", app_id = app_id, tags = tags, padding = "x" * padding_size)
+
+def build_app_list(app_count = 1000):
+    return {"applist": {"apps": [{"appid": app_id, "name": f"Mock Game {app_id}"} for app_id in range(10, 10 + app_count)]}}
+
+APP_LIST_ETAG = '"mock-app-list-v1"'
+
+def make_handler(latency, error_rate):
+    class MockSteamHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, content_type, headers = None):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            time.sleep(latency)
+            if random.random() < error_rate:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            url = urlparse(self.path)
+            if url.path == "/api/appdetails":
+                app_id = int(parse_qs(url.query)["appids"][0])
+                self.send_body(200, json.dumps(build_app_details(app_id)), "application/json")
+            elif url.path.startswith("/app/"):
+                app_id = int(url.path.strip("/").split("/")[1])
+                self.send_body(200, build_store_page(app_id), "text/html; charset=utf-8")
+            elif url.path == "/ISteamApps/GetAppList/v2/":
+                if self.headers.get("If-None-Match") == APP_LIST_ETAG:
+                    self.send_response(304)
+                    self.send_header("ETag", APP_LIST_ETAG)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_body(200, json.dumps(build_app_list()), "application/json", {"ETag": APP_LIST_ETAG})
+            elif url.path == "/ISteamUserStats/GetNumberOfCurrentPlayers/v1/":
+                app_id = int(parse_qs(url.query)["appid"][0])
+                self.send_body(200, json.dumps({"response": {"player_count": app_id * 7, "result": 1}}), "application/json")
+            else:
+                self.send_body(404, "Not found", "text/plain")
+
+    return MockSteamHandler
+
+def start_mock_steam_server(host = "127.0.0.1", port = 0, latency = 0.15, error_rate = 0.0):
+    server = ThreadingHTTPServer((host, port), make_handler(latency, error_rate))
+    server.daemon_threads = True
+    server.handle_error = lambda request, client_address: None
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
@@ -6,6 +6,13 @@ dbname = "SteamGamesDB"
 user = "postgres"
 password = "admin"
 
+HNSW_INDEXED_COLUMNS = ["short_description_vector", "about_the_game_vector", "metadata_vector"]
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+PARTIAL_HNSW_FILTERS = {"free": "is_free"}
+JSONB_FILTER_COLUMNS = ["tags", "genres"]
+BTREE_FILTER_COLUMNS = ["price", "release_date"]
+
 def create_tables():
     try:
         connection = psycopg.connect(
@@ -45,12 +52,73 @@ def create_tables():
             detailed_description_vector vector(768),
             about_the_game_vector vector(768),
             short_description_vector vector(768),
-            metadata_vector vector(768)
+            metadata_vector vector(768),
+            content_hashes JSONB
         );
         """
         cursor.execute(create_games_table_query)
+        cursor.execute("ALTER TABLE games ADD COLUMN IF NOT EXISTS content_hashes JSONB;")
         print("The 'games' table has been created successfully.")
 
+        for column in HNSW_INDEXED_COLUMNS:
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS games_{column}_hnsw_idx ON games
+                USING hnsw ({column} vector_cosine_ops)
+                WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION});
+            """)
+        for name, predicate in PARTIAL_HNSW_FILTERS.items():
+            for column in HNSW_INDEXED_COLUMNS:
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS games_{column}_{name}_hnsw_idx ON games
+                    USING hnsw ({column} vector_cosine_ops)
+                    WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})
+                    WHERE {predicate};
+                """)
+        print("The HNSW vector indexes on 'games' have been created successfully.")
+
+        for column in JSONB_FILTER_COLUMNS:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS games_{column}_gin_idx ON games USING gin ({column} jsonb_path_ops);")
+        for column in BTREE_FILTER_COLUMNS:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS games_{column}_idx ON games ({column});")
+        print("The filter indexes on 'games' have been created successfully.")
+
+        create_game_neighbors_table_query = """
+        CREATE TABLE IF NOT EXISTS game_neighbors (
+            app_id INTEGER NOT NULL REFERENCES games(app_id) ON DELETE CASCADE,
+            vector_column TEXT NOT NULL,
+            rank SMALLINT NOT NULL,
+            neighbor_app_id INTEGER NOT NULL,
+            similarity REAL NOT NULL,
+            PRIMARY KEY (app_id, vector_column, rank)
+        );
+        """
+        cursor.execute(create_game_neighbors_table_query)
+        print("The 'game_neighbors' table has been created successfully.")
+
+        create_game_cluster_centroids_table_query = """
+        CREATE TABLE IF NOT EXISTS game_cluster_centroids (
+            vector_column TEXT NOT NULL,
+            cluster_id INTEGER NOT NULL,
+            centroid vector(768) NOT NULL,
+            size INTEGER NOT NULL,
+            PRIMARY KEY (vector_column, cluster_id)
+        );
+        """
+        cursor.execute(create_game_cluster_centroids_table_query)
+
+        create_game_clusters_table_query = """
+        CREATE TABLE IF NOT EXISTS game_clusters (
+            app_id INTEGER NOT NULL REFERENCES games(app_id) ON DELETE CASCADE,
+            vector_column TEXT NOT NULL,
+            cluster_id INTEGER NOT NULL,
+            similarity REAL NOT NULL,
+            PRIMARY KEY (app_id, vector_column)
+        );
+        """
+        cursor.execute(create_game_clusters_table_query)
+        cursor.execute("CREATE INDEX IF NOT EXISTS game_clusters_cluster_idx ON game_clusters (vector_column, cluster_id);")
+        print("The 'game_clusters' and 'game_cluster_centroids' tables have been created successfully.")
+
         create_users_table_query = """
         CREATE TABLE IF NOT EXISTS users (
             user_id SERIAL PRIMARY KEY,
@@ -1,10 +1,27 @@
 import os
 import sys
+import asyncio
 import logging
-from psycopg2 import pool
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
+
+from Scripts.Database.vector_adapter import register_vector_adapter
 
 sys.stdout.reconfigure(encoding = 'utf-8', errors = 'replace')
 
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+host = "localhost"
+port = "1234"
+dbname = "SteamGamesDB"
+user = "postgres"
+password = "admin"
+
+POOL_TIMEOUT = 30.0
+MAX_LIFETIME = 3600.0
+MAX_IDLE = 600.0
+PREPARE_THRESHOLD = 5
+
 def setup_logger():
     log_dir = '../GameRecommendation/Logs/Database'
     os.makedirs(log_dir, exist_ok = True)
@@ -20,41 +37,115 @@ def setup_logger():
 logger = setup_logger()
 
 db_pool = None
+async_db_pool = None
+
+def connection_kwargs():
+    return {
+        "host": host,
+        "port": port,
+        "dbname": dbname,
+        "user": user,
+        "password": password,
+        "prepare_threshold": PREPARE_THRESHOLD
+    }
+
+def configure_connection(connection):
+    register_vector_adapter(connection)
 
-def create_connection_pool(minconn = 1, maxconn = 10):
+async def configure_async_connection(connection):
+    register_vector_adapter(connection)
+
+def create_connection_pool(minconn = 1, maxconn = 10, timeout = POOL_TIMEOUT, max_lifetime = MAX_LIFETIME, max_idle = MAX_IDLE):
     global db_pool
+    if db_pool is not None:
+        return db_pool
     try:
-        db_pool = pool.SimpleConnectionPool(
-            minconn = minconn,
-            maxconn = maxconn,
-            host = "localhost",
-            port = "1234",
-            dbname = "SteamGamesDB",
-            user = "postgres",
-            password = "admin"
+        db_pool = ConnectionPool(
+            kwargs = connection_kwargs(),
+            min_size = minconn,
+            max_size = maxconn,
+            timeout = timeout,
+            max_lifetime = max_lifetime,
+            max_idle = max_idle,
+            configure = configure_connection,
+            check = ConnectionPool.check_connection,
+            name = "games",
+            open = False
         )
-        if db_pool:
-            logger.info("Connection pool created successfully.")
+        db_pool.open(wait = True, timeout = timeout)
+        logger.info(f"Connection pool created successfully ({minconn}-{maxconn} connections).")
     except Exception as e:
+        db_pool = None
         logger.error(f"Failed to create connection pool: {e}")
         raise
+    return db_pool
+
+def has_connection_pool():
+    return db_pool is not None
 
 def get_connection():
-    global db_pool
     if not db_pool:
         logger.error("Connection pool has not been initialized. Please call create_connection_pool first.")
         raise Exception("Connection pool has not been initialized.")
-    logger.info("Connection retrieved from pool.")
     return db_pool.getconn()
 
 def return_connection(connection):
-    global db_pool
     if db_pool:
         db_pool.putconn(connection)
-        logger.info("Connection returned to pool.")
+
+def connection():
+    if not db_pool:
+        raise Exception("Connection pool has not been initialized.")
+    return db_pool.connection()
+
+def pool_stats():
+    return db_pool.get_stats() if db_pool else {}
 
 def close_connection_pool():
     global db_pool
     if db_pool:
-        db_pool.closeall()
+        logger.info(f"Connection pool stats: {db_pool.get_stats()}")
+        db_pool.close()
+        db_pool = None
         logger.info("Connection pool closed.")
+
+async def create_async_connection_pool(minconn = 1, maxconn = 10, timeout = POOL_TIMEOUT, max_lifetime = MAX_LIFETIME, max_idle = MAX_IDLE):
+    global async_db_pool
+    if async_db_pool is not None:
+        return async_db_pool
+    try:
+        async_db_pool = AsyncConnectionPool(
+            kwargs = connection_kwargs(),
+            min_size = minconn,
+            max_size = maxconn,
+            timeout = timeout,
+            max_lifetime = max_lifetime,
+            max_idle = max_idle,
+            configure = configure_async_connection,
+            check = AsyncConnectionPool.check_connection,
+            name = "games-async",
+            open = False
+        )
+        await async_db_pool.open(wait = True, timeout = timeout)
+        logger.info(f"Async connection pool created successfully ({minconn}-{maxconn} connections).")
+    except Exception as e:
+        async_db_pool = None
+        logger.error(f"Failed to create async connection pool: {e}")
+        raise
+    return async_db_pool
+
+def async_connection():
+    if not async_db_pool:
+        raise Exception("Async connection pool has not been initialized.")
+    return async_db_pool.connection()
+
+def async_pool_stats():
+    return async_db_pool.get_stats() if async_db_pool else {}
+
+async def close_async_connection_pool():
+    global async_db_pool
+    if async_db_pool:
+        logger.info(f"Async connection pool stats: {async_db_pool.get_stats()}")
+        await async_db_pool.close()
+        async_db_pool = None
+        logger.info("Async connection pool closed.")
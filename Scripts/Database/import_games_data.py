@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+from itertools import islice
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.stdout.reconfigure(encoding = 'utf-8', errors = 'replace')
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files
+from Scripts.SteamApi.vector_store import iter_games_with_vectors
+from Scripts.Database.db_connection_pool import create_connection_pool, close_connection_pool
+from Scripts.Database.insert_data_to_database import insert_data_bulk, database_logger, BULK_BATCH_SIZE
+
+CHECKPOINT_PATH = '../GameRecommendation/Logs/Database/import_checkpoint.json'
+
+def load_checkpoint(path = CHECKPOINT_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding = 'utf-8') as f:
+        return json.load(f)
+
+def save_checkpoint(checkpoint, path = CHECKPOINT_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding = 'utf-8') as f:
+        json.dump(checkpoint, f, indent = 4)
+    os.replace(temp_path, path)
+
+def iter_batches(records, batch_size):
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def import_part(path, checkpoint, batch_size, on_conflict):
+    part_name = os.path.basename(path)
+    state = checkpoint.setdefault(part_name, {"records": 0, "errors": 0, "completed": False})
+    if state["completed"]:
+        database_logger.info(f"Skipping {part_name}, already imported.")
+        return
+
+    records = islice(iter_games_with_vectors(path), state["records"], None)
+    for batch in iter_batches(records, batch_size):
+        success_count, error_count = insert_data_bulk(batch, batch_size = batch_size, on_conflict = on_conflict, silent = True, strict = True)
+        state["records"] += len(batch)
+        state["errors"] += error_count
+        save_checkpoint(checkpoint)
+        database_logger.info(f"{part_name}: imported {state['records']} records so far ({success_count} in last batch, {error_count} errors).")
+
+    state["completed"] = True
+    save_checkpoint(checkpoint)
+
+def import_games_data(directory = DATA_DIR, batch_size = BULK_BATCH_SIZE, on_conflict = "update", checkpoint_path = CHECKPOINT_PATH):
+    create_connection_pool(minconn = 1, maxconn = 2)
+
+    try:
+        checkpoint = load_checkpoint(checkpoint_path)
+        part_files = list_part_files(directory)
+        database_logger.info(f"Started streaming import of {len(part_files)} part files from {directory}.")
+
+        for path in part_files:
+            try:
+                import_part(path, checkpoint, batch_size, on_conflict)
+            except Exception as e:
+                database_logger.error(f"Failed to import {path}: {e}. Rerun to resume from the last checkpoint.")
+                return
+
+        total_records = sum(state["records"] for state in checkpoint.values())
+        total_errors = sum(state["errors"] for state in checkpoint.values())
+        database_logger.info(f"Finished streaming import. Records read: {total_records}, errors: {total_errors}.")
+        database_logger.info("------------End of streaming import------------\n")
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    finally:
+        close_connection_pool()
+
+import_games_data()
@@ -3,14 +3,25 @@ import re
 import sys
 import json
 import logging
-from psycopg2 import sql
 from datetime import datetime
 
 sys.stdout.reconfigure(encoding = 'utf-8', errors = 'replace')
 
 from Scripts.Database.db_connection_pool import get_connection, return_connection
+from Scripts.Database.vector_adapter import to_vector_array, vector_text
 
 VECTOR_SIZE = 768
+BULK_BATCH_SIZE = 5000
+STAGING_TABLE = "games_staging"
+
+GAME_COLUMNS = [
+    "app_id", "game_name", "type", "developer", "publisher", "is_free", "price",
+    "age_rating", "detailed_description", "short_description", "about_the_game",
+    "minimum_requirements", "recommended_requirements", "categories", "tags", "genres",
+    "recommendations", "release_date", "release_date_days",
+    "features", "detailed_description_vector", "about_the_game_vector", "short_description_vector",
+    "metadata_vector", "content_hashes"
+]
 
 def setup_logger():
     log_dir = '../GameRecommendation/Logs/Database'
@@ -84,12 +95,99 @@ def validate_integer(value):
     return None
 
 def normalize_vector(vector, size = VECTOR_SIZE):
-    if not isinstance(vector, list):
-        return [0.0] * size
-    vector = [float(x) for x in vector]
-    if len(vector) > size:
-        return vector[:size]
-    return vector + [0.0] * (size - len(vector))
+    return to_vector_array(vector, size)
+
+INSERT_GAME_QUERY = """
+    INSERT INTO games (
+        app_id, game_name, type, developer, publisher, is_free, price, 
+        age_rating, detailed_description, short_description, about_the_game, 
+        minimum_requirements, recommended_requirements, categories, tags, genres,
+        recommendations, release_date, release_date_days,
+        features, detailed_description_vector, about_the_game_vector, short_description_vector,
+        metadata_vector, content_hashes
+    ) VALUES (
+        %(App ID)s, %(Game Name)s, %(Type)s, %(Developer)s, %(Publisher)s, %(Is Free)s, %(Price)s,
+        %(Age Rating)s, %(Detailed Description)s, %(Short Description)s, %(About the Game)s,
+        %(Minimum Requirements)s, %(Recommended Requirements)s, %(Categories)s, %(Tags)s, %(Genres)s,
+        %(Recommendations)s, %(Release Date)s, %(Release Date Days)s,
+        %(Features)s, %(Detailed Description Vector)s, %(About the Game Vector)s, %(Short Description Vector)s,
+        %(Metadata Vector)s, %(Content Hashes)s
+    )
+    ON CONFLICT (app_id) DO NOTHING;
+"""
+
+def conflict_update_clause():
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in GAME_COLUMNS if column != "app_id")
+    return f"ON CONFLICT (app_id) DO UPDATE SET {updates}"
+
+UPSERT_GAME_QUERY = INSERT_GAME_QUERY.replace("ON CONFLICT (app_id) DO NOTHING", conflict_update_clause())
+
+def game_to_query_params(game):
+    release_date, release_date_days = parse_release_date(game.get('Release Date'))
+
+    return {
+        'App ID': game.get('App ID'),
+        'Game Name': game.get('Game Name'),
+        'Type': game.get('Type'),
+        'Developer': game.get('Developer'),
+        'Publisher': game.get('Publisher'),
+        'Is Free': game.get('Is Free'),
+        'Price': game.get('Price'),
+        'Age Rating': validate_integer(game.get('Age Rating')),
+        'Detailed Description': game.get('Detailed Description'),
+        'Short Description': game.get('Short Description'),
+        'About the Game': game.get('About the Game'),
+        'Minimum Requirements': game.get('Minimum Requirements'),
+        'Recommended Requirements': game.get('Recommended Requirements'),
+        'Categories': json.dumps(game.get('Categories')),
+        'Tags': json.dumps(game.get('Tags')),
+        'Genres': json.dumps(game.get('Genres')),
+        'Recommendations': validate_integer(game.get('Recommendations')),
+        'Release Date': release_date,
+        'Release Date Days': release_date_days,
+        'Features': normalize_vector(game.get('Features', []), VECTOR_SIZE),
+        'Detailed Description Vector': normalize_vector(game.get('Detailed Description Vector', []), VECTOR_SIZE),
+        'About the Game Vector': normalize_vector(game.get('About the Game Vector', []), VECTOR_SIZE),
+        'Short Description Vector': normalize_vector(game.get('Short Description Vector', []), VECTOR_SIZE),
+        'Metadata Vector': normalize_vector(game.get('Metadata Vector', []), VECTOR_SIZE),
+        'Content Hashes': copy_json_value(game.get('Content Hashes'))
+    }
+
+def insert_games_row_by_row(cursor, connection, data, batch_size = 1000, on_conflict = "nothing"):
+    query = UPSERT_GAME_QUERY if on_conflict == "update" else INSERT_GAME_QUERY
+    success_count = 0
+    error_count = 0
+
+    for game in data:
+        savepoint_active = False
+        try:
+            if not game.get('App ID') or not game.get('Game Name'):
+                app_id = game.get('App ID', 'UNKNOWN')
+                database_logger.error(f"Missing required fields for game with App ID: {app_id}")
+                error_count += 1
+                continue
+
+            cursor.execute("SAVEPOINT game_insert;")
+            savepoint_active = True
+            cursor.execute(query, game_to_query_params(game))
+            cursor.execute("RELEASE SAVEPOINT game_insert;")
+            savepoint_active = False
+
+            success_count += 1
+
+            if success_count % batch_size == 0:
+                connection.commit()
+                database_logger.info(f"Committed batch of {batch_size} records.")
+
+        except Exception as e:
+            error_count += 1
+            database_logger.error(f"Error inserting data for game {game.get('App ID')}: {e}")
+            if not savepoint_active:
+                raise
+            cursor.execute("ROLLBACK TO SAVEPOINT game_insert;")
+
+    connection.commit()
+    return success_count, error_count
 
 def insert_data_from_object(data, silent = False):
     connection = None
@@ -98,89 +196,221 @@ def insert_data_from_object(data, silent = False):
         connection = get_connection()
         cursor = connection.cursor()
 
-        success_count = 0
-        error_count = 0
-        batch_size = 1000
-
         if not silent:
             database_logger.info("Started importing game data to the database...")
 
-        for game in data:
+        success_count, error_count = insert_games_row_by_row(cursor, connection, data)
+
+        if not silent:
+            if error_count == 0:
+                database_logger.info(f"Successfully imported all {success_count} games.")
+            else:
+                database_logger.warning(f"Import completed with {success_count} successes and {error_count} errors.")
+            database_logger.info(f"------------End of data importing------------\n")
+
+    except Exception as e:
+        database_logger.error(f"Critical error: {e}")
+        if connection:
+            connection.rollback()
+    finally:
+        if connection:
+            return_connection(connection)
+
+def copy_text_value(value):
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def copy_array_value(values):
+    if values is None:
+        return None
+    if not isinstance(values, list):
+        values = [values]
+    items = ["NULL" if item is None else '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"' for item in values]
+    return "{" + ",".join(items) + "}"
+
+def copy_json_value(value):
+    return json.dumps(value) if value else None
+
+def copy_vector_value(vector):
+    return vector_text(normalize_vector(vector, VECTOR_SIZE))
+
+def copy_boolean_value(value):
+    if value is None:
+        return None
+    return "t" if value else "f"
+
+def game_to_copy_row(game):
+    release_date, release_date_days = parse_release_date(game.get('Release Date'))
+    values = [
+        game.get('App ID'),
+        game.get('Game Name'),
+        game.get('Type'),
+        copy_array_value(game.get('Developer')),
+        copy_array_value(game.get('Publisher')),
+        copy_boolean_value(game.get('Is Free')),
+        game.get('Price'),
+        validate_integer(game.get('Age Rating')),
+        game.get('Detailed Description'),
+        game.get('Short Description'),
+        game.get('About the Game'),
+        game.get('Minimum Requirements'),
+        game.get('Recommended Requirements'),
+        json.dumps(game.get('Categories')),
+        json.dumps(game.get('Tags')),
+        json.dumps(game.get('Genres')),
+        validate_integer(game.get('Recommendations')),
+        release_date.isoformat() if release_date else None,
+        release_date_days,
+        copy_vector_value(game.get('Features', [])),
+        copy_vector_value(game.get('Detailed Description Vector', [])),
+        copy_vector_value(game.get('About the Game Vector', [])),
+        copy_vector_value(game.get('Short Description Vector', [])),
+        copy_vector_value(game.get('Metadata Vector', [])),
+        copy_json_value(game.get('Content Hashes'))
+    ]
+    return "\t".join(copy_text_value(value) for value in values) + "\n"
+
+def merge_staging_query(on_conflict):
+    columns = ", ".join(GAME_COLUMNS)
+    if on_conflict == "update":
+        conflict_clause = conflict_update_clause()
+    else:
+        conflict_clause = "ON CONFLICT (app_id) DO NOTHING"
+    return f"""
+        INSERT INTO games ({columns})
+        SELECT DISTINCT ON (app_id) {columns} FROM {STAGING_TABLE}
+        ORDER BY app_id
+        {conflict_clause};
+    """
+
+def copy_rows_to_staging(cursor, rows):
+    columns = ", ".join(GAME_COLUMNS)
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} AS SELECT {columns} FROM games WITH NO DATA;")
+    cursor.execute(f"TRUNCATE {STAGING_TABLE};")
+    with cursor.copy(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN") as copy:
+        copy.write("".join(rows))
+
+def copy_batch_to_games(cursor, rows, on_conflict):
+    copy_rows_to_staging(cursor, rows)
+    cursor.execute(merge_staging_query(on_conflict))
+    merged = cursor.rowcount
+    cursor.execute(f"TRUNCATE {STAGING_TABLE};")
+    return merged
+
+def insert_data_bulk(data, batch_size = BULK_BATCH_SIZE, on_conflict = "nothing", silent = False, strict = False):
+    connection = None
+    success_count = 0
+    error_count = 0
+    merged_count = 0
+
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+
+        if not silent:
+            database_logger.info("Started bulk importing game data to the database...")
+
+        def flush(rows, games):
+            nonlocal success_count, error_count, merged_count
             try:
-                if not game.get('App ID') or not game.get('Game Name'):
-                    app_id = game.get('App ID', 'UNKNOWN')
-                    database_logger.error(f"Missing required fields for game with App ID: {app_id}")
-                    error_count += 1
-                    continue
-
-                query = """
-                    INSERT INTO games (
-                        app_id, game_name, type, developer, publisher, is_free, price, 
-                        age_rating, detailed_description, short_description, about_the_game, 
-                        minimum_requirements, recommended_requirements, categories, tags, genres,
-                        recommendations, release_date, release_date_days,
-                        features, detailed_description_vector, about_the_game_vector, short_description_vector,
-                        metadata_vector
-                    ) VALUES (
-                        %(App ID)s, %(Game Name)s, %(Type)s, %(Developer)s, %(Publisher)s, %(Is Free)s, %(Price)s,
-                        %(Age Rating)s, %(Detailed Description)s, %(Short Description)s, %(About the Game)s,
-                        %(Minimum Requirements)s, %(Recommended Requirements)s, %(Categories)s, %(Tags)s, %(Genres)s,
-                        %(Recommendations)s, %(Release Date)s, %(Release Date Days)s,
-                        %(Features)s, %(Detailed Description Vector)s, %(About the Game Vector)s, %(Short Description Vector)s,
-                        %(Metadata Vector)s
-                    )
-                    ON CONFLICT (app_id) DO NOTHING;
-                """
-
-                release_date, release_date_days = parse_release_date(game.get('Release Date'))
-
-                cursor.execute(query, {
-                    'App ID': game.get('App ID'),
-                    'Game Name': game.get('Game Name'),
-                    'Type': game.get('Type'),
-                    'Developer': game.get('Developer'),
-                    'Publisher': game.get('Publisher'),
-                    'Is Free': game.get('Is Free'),
-                    'Price': game.get('Price'),
-                    'Age Rating': validate_integer(game.get('Age Rating')),
-                    'Detailed Description': game.get('Detailed Description'),
-                    'Short Description': game.get('Short Description'),
-                    'About the Game': game.get('About the Game'),
-                    'Minimum Requirements': game.get('Minimum Requirements'),
-                    'Recommended Requirements': game.get('Recommended Requirements'),
-                    'Categories': json.dumps(game.get('Categories')),
-                    'Tags': json.dumps(game.get('Tags')),
-                    'Genres': json.dumps(game.get('Genres')),
-                    'Recommendations': validate_integer(game.get('Recommendations')),
-                    'Release Date': release_date,
-                    'Release Date Days': release_date_days,
-                    'Features': normalize_vector(game.get('Features', []), VECTOR_SIZE),
-                    'Detailed Description Vector': normalize_vector(game.get('Detailed Description Vector', []), VECTOR_SIZE),
-                    'About the Game Vector': normalize_vector(game.get('About the Game Vector', []), VECTOR_SIZE),
-                    'Short Description Vector': normalize_vector(game.get('Short Description Vector', []), VECTOR_SIZE),
-                    'Metadata Vector': normalize_vector(game.get('Metadata Vector', []), VECTOR_SIZE)
-                })
-
-                success_count += 1
-
-                if success_count % batch_size == 0:
-                    connection.commit()
-                    database_logger.info(f"Committed batch of {batch_size} records.")
+                merged_count += copy_batch_to_games(cursor, rows, on_conflict)
+                connection.commit()
+                success_count += len(rows)
+                database_logger.info(f"Copied batch of {len(rows)} records.")
+            except Exception as e:
+                connection.rollback()
+                database_logger.warning(f"Bulk copy of {len(rows)} records failed, retrying row by row: {e}")
+                batch_successes, batch_errors = insert_games_row_by_row(cursor, connection, games, on_conflict = on_conflict)
+                success_count += batch_successes
+                error_count += batch_errors
 
+        rows = []
+        games = []
+        for game in data:
+            if not game.get('App ID') or not game.get('Game Name'):
+                app_id = game.get('App ID', 'UNKNOWN')
+                database_logger.error(f"Missing required fields for game with App ID: {app_id}")
+                error_count += 1
+                continue
+
+            try:
+                rows.append(game_to_copy_row(game))
+                games.append(game)
             except Exception as e:
                 error_count += 1
-                database_logger.error(f"Error inserting data for game {game.get('App ID')}: {e}")
-                connection.rollback()
+                database_logger.error(f"Error preparing data for game {game.get('App ID')}: {e}")
+                continue
+
+            if len(rows) >= batch_size:
+                flush(rows, games)
+                rows = []
+                games = []
 
-        connection.commit()
+        if rows:
+            flush(rows, games)
 
         if not silent:
             if error_count == 0:
-                database_logger.info(f"Successfully imported all {success_count} games.")
+                database_logger.info(f"Successfully imported all {success_count} games ({merged_count} rows written).")
             else:
-                database_logger.warning(f"Import completed with {success_count} successes and {error_count} errors.")
+                database_logger.warning(f"Import completed with {success_count} successes and {error_count} errors ({merged_count} rows written).")
             database_logger.info(f"------------End of data importing------------\n")
 
+    except Exception as e:
+        database_logger.error(f"Critical error: {e}")
+        if connection:
+            connection.rollback()
+        if strict:
+            raise
+    finally:
+        if connection:
+            return_connection(connection)
+
+    return success_count, error_count
+
+def update_columns_query(columns):
+    assignments = ", ".join(f"{column} = staging.{column}" for column in list(columns) + ["content_hashes"])
+    return f"""
+        UPDATE games SET {assignments}
+        FROM (SELECT DISTINCT ON (app_id) * FROM {STAGING_TABLE} ORDER BY app_id) AS staging
+        WHERE games.app_id = staging.app_id;
+    """
+
+def update_changed_columns(changes, batch_size = BULK_BATCH_SIZE, silent = False):
+    connection = None
+    success_count = 0
+    error_count = 0
+    columns_written = 0
+
+    games_by_columns = {}
+    for game, columns in changes:
+        games_by_columns.setdefault(tuple(columns), []).append(game)
+
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+
+        for columns, games in games_by_columns.items():
+            for start in range(0, len(games), batch_size):
+                batch = games[start:start + batch_size]
+                try:
+                    copy_rows_to_staging(cursor, [game_to_copy_row(game) for game in batch])
+                    cursor.execute(update_columns_query(columns))
+                    updated = cursor.rowcount
+                    cursor.execute(f"TRUNCATE {STAGING_TABLE};")
+                    connection.commit()
+                    success_count += updated
+                    error_count += len(batch) - updated
+                    columns_written += updated * len(columns)
+                except Exception as e:
+                    connection.rollback()
+                    error_count += len(batch)
+                    database_logger.error(f"Failed to update {len(batch)} games ({', '.join(columns) or 'hashes only'}): {e}")
+
+        if not silent:
+            database_logger.info(f"Updated {success_count} changed games ({columns_written} columns written, {error_count} errors).")
+
     except Exception as e:
         database_logger.error(f"Critical error: {e}")
         if connection:
@@ -188,3 +418,5 @@ def insert_data_from_object(data, silent = False):
     finally:
         if connection:
             return_connection(connection)
+
+    return success_count, error_count
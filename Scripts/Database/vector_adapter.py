@@ -0,0 +1,53 @@
+import numpy as np
+import psycopg
+from psycopg.pq import Format
+from psycopg.adapt import Dumper, Loader
+from psycopg.types import TypeInfo
+
+VECTOR_SIZE = 768
+VECTOR_DTYPE = np.float32
+VECTOR_TEXT_FORMAT = "%.7g"
+
+def to_vector_array(vector, size = VECTOR_SIZE):
+    if vector is None or isinstance(vector, (str, bytes, dict)):
+        return np.zeros(size, dtype = VECTOR_DTYPE)
+    try:
+        array = np.asarray(vector, dtype = VECTOR_DTYPE).ravel()
+    except (TypeError, ValueError):
+        return np.zeros(size, dtype = VECTOR_DTYPE)
+
+    if len(array) == size:
+        return array
+    result = np.zeros(size, dtype = VECTOR_DTYPE)
+    result[:min(size, len(array))] = array[:size]
+    return result
+
+def vector_text(vector):
+    array = np.asarray(vector, dtype = VECTOR_DTYPE).ravel()
+    return "[" + ",".join([VECTOR_TEXT_FORMAT] * len(array)) % tuple(array.tolist()) + "]"
+
+class VectorDumper(Dumper):
+    def dump(self, obj):
+        return vector_text(obj).encode("utf-8")
+
+def register_vector_adapter(context = None):
+    adapters = context.adapters if context is not None else psycopg.adapters
+    adapters.register_dumper(np.ndarray, VectorDumper)
+
+class VectorLoader(Loader):
+    def load(self, data):
+        return np.array(bytes(data)[1:-1].split(b","), dtype = VECTOR_DTYPE)
+
+class VectorBinaryLoader(Loader):
+    format = Format.BINARY
+
+    def load(self, data):
+        return np.frombuffer(data, dtype = ">f4", offset = 4).astype(VECTOR_DTYPE)
+
+def register_vector_loader(connection):
+    info = TypeInfo.fetch(connection, "vector")
+    if info is None:
+        return False
+    connection.adapters.register_loader(info.oid, VectorLoader)
+    connection.adapters.register_loader(info.oid, VectorBinaryLoader)
+    return True
@@ -0,0 +1,146 @@
+import time
+import queue
+import bisect
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from Scripts.SteamApi.embedding_cache import normalize_text
+from Scripts.SteamApi.game_data_to_vector import encode_texts, get_model
+
+BATCH_WINDOW_MS = 5
+MAX_BATCH_SIZE = 32
+QUERY_CACHE_SIZE = 10000
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+class EmbeddingService:
+    def __init__(self, batch_window_ms = BATCH_WINDOW_MS, max_batch_size = MAX_BATCH_SIZE, cache_size = QUERY_CACHE_SIZE):
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.worker = None
+
+    def start(self):
+        with self.lock:
+            if self.worker is None:
+                get_model()
+                encode_texts(["warm up"], use_disk_cache = False)
+                self.worker = threading.Thread(target = self.run, name = "embedding-service", daemon = True)
+                self.worker.start()
+        return self
+
+    def record_latency(self, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.latency_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def cached(self, key):
+        with self.lock:
+            vector = self.cache.get(key)
+            if vector is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return vector
+
+    def remember(self, key, vector):
+        with self.lock:
+            self.cache[key] = vector
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last = False)
+
+    def embed(self, query_text, timeout = None):
+        started = time.perf_counter()
+        key = normalize_text(query_text)
+        vector = self.cached(key)
+
+        if vector is None:
+            if self.worker is None:
+                self.start()
+            future = Future()
+            self.requests.put((key, future))
+            vector = future.result(timeout = timeout)
+
+        self.record_latency(started)
+        return vector
+
+    def collect_batch(self):
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout = remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.collect_batch()
+            texts = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                vectors = dict(zip(texts, encode_texts(texts, use_disk_cache = False)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for text, vector in vectors.items():
+                self.remember(text, vector)
+            for key, future in batch:
+                future.set_result(vectors[key])
+
+            with self.lock:
+                self.batches += 1
+                self.batched_queries += len(batch)
+
+    def latency_percentile(self, percentile):
+        total = sum(self.latency_counts)
+        if total == 0:
+            return None
+        threshold = total * percentile / 100
+        running = 0
+        for index, count in enumerate(self.latency_counts):
+            running += count
+            if running >= threshold:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else float("inf")
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            histogram = {f"<={bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_counts)}
+            histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = self.latency_counts[-1]
+            return {
+                "cache_hits": self.hits,
+                "cache_misses": self.misses,
+                "cache_hit_rate": self.hits / lookups if lookups else 0.0,
+                "cache_entries": len(self.cache),
+                "batches": self.batches,
+                "average_batch_size": self.batched_queries / self.batches if self.batches else 0.0,
+                "latency_p50_ms": self.latency_percentile(50),
+                "latency_p95_ms": self.latency_percentile(95),
+                "latency_histogram": histogram
+            }
+
+embedding_service = None
+embedding_service_lock = threading.Lock()
+
+def get_embedding_service():
+    global embedding_service
+    with embedding_service_lock:
+        if embedding_service is None:
+            embedding_service = EmbeddingService().start()
+        return embedding_service
@@ -0,0 +1,322 @@
+import os
+import sys
+import time
+import logging
+import numpy as np
+from psycopg import sql
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.Database.db_connection_pool import create_connection_pool, close_connection_pool, has_connection_pool, get_connection, return_connection
+from Scripts.Database.vector_adapter import register_vector_loader
+from Scripts.Recommendation.vector_search import SEARCH_COLUMNS, VECTOR_SIZE
+from Scripts.Recommendation.in_memory_search import normalize_rows, top_k
+
+NEIGHBOR_COLUMNS = SEARCH_COLUMNS
+NEIGHBORS_PER_COLUMN = 20
+CLUSTER_PROBES = 8
+KMEANS_ITERATIONS = 20
+KMEANS_SAMPLE_SIZE = 50000
+KMEANS_SEED = 42
+ASSIGN_BLOCK_ROWS = 8192
+NEIGHBOR_WORKERS = os.cpu_count() or 1
+
+NEIGHBOR_ROWS_QUERY = """
+    SELECT n.vector_column, n.rank, n.similarity, g.app_id, g.game_name, g.short_description, g.price, g.is_free
+    FROM game_neighbors n JOIN games g ON g.app_id = n.neighbor_app_id
+    WHERE n.app_id = %(app_id)s AND n.vector_column = ANY(%(columns)s) AND {where}
+    ORDER BY n.vector_column, n.rank;
+"""
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Recommendation'
+    os.makedirs(log_dir, exist_ok = True)
+    log_file_path = os.path.join(log_dir, 'game_neighbors.log')
+    logger = logging.getLogger(__name__)
+    handler = logging.FileHandler(log_file_path, encoding = 'utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+neighbors_logger = setup_logger()
+
+def default_cluster_count(count):
+    return max(1, int(np.sqrt(count)))
+
+def assign_clusters(matrix, centroids, workers = NEIGHBOR_WORKERS):
+    labels = np.empty(len(matrix), dtype = np.int64)
+    similarities = np.empty(len(matrix), dtype = np.float32)
+
+    def assign_block(start):
+        scores = matrix[start:start + ASSIGN_BLOCK_ROWS] @ centroids.T
+        labels[start:start + ASSIGN_BLOCK_ROWS] = scores.argmax(axis = 1)
+        similarities[start:start + ASSIGN_BLOCK_ROWS] = scores.max(axis = 1)
+
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        list(executor.map(assign_block, range(0, len(matrix), ASSIGN_BLOCK_ROWS)))
+    return labels, similarities
+
+def spherical_kmeans(matrix, cluster_count, iterations = KMEANS_ITERATIONS, sample_size = KMEANS_SAMPLE_SIZE, seed = KMEANS_SEED, workers = NEIGHBOR_WORKERS):
+    rng = np.random.default_rng(seed)
+    sample = matrix[rng.choice(len(matrix), sample_size, replace = False)] if len(matrix) > sample_size else matrix
+    cluster_count = min(cluster_count, len(sample))
+    centroids = sample[rng.choice(len(sample), cluster_count, replace = False)].copy()
+
+    for _ in range(iterations):
+        labels, _ = assign_clusters(sample, centroids, workers)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.flatnonzero(np.bincount(labels, minlength = cluster_count) == 0)
+        sums[empty] = sample[rng.choice(len(sample), len(empty), replace = False)]
+        previous = centroids
+        centroids = normalize_rows(sums)
+        if np.array_equal(previous, centroids):
+            break
+    return centroids
+
+def cluster_routes(centroids, probes = CLUSTER_PROBES):
+    return top_k(centroids @ centroids.T, min(probes, len(centroids))).T
+
+def cluster_members(labels, cluster_count):
+    order = np.argsort(labels, kind = "stable")
+    bounds = np.searchsorted(labels[order], np.arange(cluster_count + 1))
+    return [order[bounds[cluster]:bounds[cluster + 1]] for cluster in range(cluster_count)]
+
+def routed_neighbors(matrix, labels, routes, query_rows, k = NEIGHBORS_PER_COLUMN, workers = NEIGHBOR_WORKERS):
+    members = cluster_members(labels, len(routes))
+    query_clusters = cluster_members(labels[query_rows], len(routes))
+    neighbors = {}
+
+    def search_cluster(cluster):
+        queries = query_rows[query_clusters[cluster]]
+        if len(queries) == 0:
+            return
+        candidates = np.sort(np.concatenate([members[route] for route in routes[cluster]]))
+        scores = matrix[candidates] @ matrix[queries].T
+        own = np.searchsorted(candidates, queries)
+        found = own < len(candidates)
+        found[found] = candidates[own[found]] == queries[found]
+        scores[own[found], np.flatnonzero(found)] = -np.inf
+        nearest = top_k(scores, min(k, len(candidates) - 1))
+        for position, row in enumerate(queries):
+            rows = nearest[:, position]
+            neighbors[int(row)] = (candidates[rows], scores[rows, position])
+
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        list(executor.map(search_cluster, range(len(routes))))
+    return neighbors
+
+def neighbor_lines(column, app_ids, neighbors):
+    lines = []
+    for row, (neighbor_rows, similarities) in neighbors.items():
+        for rank, (neighbor_row, similarity) in enumerate(zip(neighbor_rows, similarities), start = 1):
+            lines.append(f"{app_ids[row]}\t{column}\t{rank}\t{app_ids[neighbor_row]}\t{similarity:.6g}\n")
+    return lines
+
+def load_column_vectors(cursor, column, app_ids = None):
+    if app_ids is None:
+        cursor.execute(f"SELECT app_id, {column} FROM games WHERE {column} IS NOT NULL ORDER BY app_id;")
+    else:
+        cursor.execute(f"SELECT app_id, {column} FROM games WHERE {column} IS NOT NULL AND app_id = ANY(%s) ORDER BY app_id;", (list(app_ids),))
+    rows = cursor.fetchall()
+    if not rows:
+        return np.zeros(0, dtype = np.int64), None
+    return np.array([row[0] for row in rows], dtype = np.int64), normalize_rows(np.stack([row[1] for row in rows]))
+
+def write_neighbor_lines(cursor, lines):
+    with cursor.copy("COPY game_neighbors (app_id, vector_column, rank, neighbor_app_id, similarity) FROM STDIN") as copy:
+        copy.write("".join(lines))
+
+def write_cluster_assignments(cursor, column, app_ids, labels, similarities):
+    cursor.execute("""
+        INSERT INTO game_clusters (app_id, vector_column, cluster_id, similarity)
+        SELECT app_id, %s, cluster_id, similarity FROM unnest(%s::integer[], %s::integer[], %s::real[]) AS a(app_id, cluster_id, similarity)
+        ON CONFLICT (app_id, vector_column) DO UPDATE SET cluster_id = EXCLUDED.cluster_id, similarity = EXCLUDED.similarity;
+    """, (column, app_ids.tolist(), labels.tolist(), similarities.tolist()))
+
+def build_column_neighbors(cursor, column, k = NEIGHBORS_PER_COLUMN, cluster_count = None, probes = CLUSTER_PROBES, workers = NEIGHBOR_WORKERS):
+    start = time.perf_counter()
+    app_ids, matrix = load_column_vectors(cursor, column)
+    if matrix is None:
+        return 0
+    loaded = time.perf_counter()
+
+    centroids = spherical_kmeans(matrix, cluster_count or default_cluster_count(len(matrix)), workers = workers)
+    labels, similarities = assign_clusters(matrix, centroids, workers)
+    routes = cluster_routes(centroids, probes)
+    clustered = time.perf_counter()
+
+    neighbors = routed_neighbors(matrix, labels, routes, np.arange(len(matrix)), k, workers)
+    searched = time.perf_counter()
+
+    cursor.execute("DELETE FROM game_neighbors WHERE vector_column = %s;", (column,))
+    cursor.execute("DELETE FROM game_clusters WHERE vector_column = %s;", (column,))
+    cursor.execute("DELETE FROM game_cluster_centroids WHERE vector_column = %s;", (column,))
+    sizes = np.bincount(labels, minlength = len(centroids))
+    cursor.executemany(
+        "INSERT INTO game_cluster_centroids (vector_column, cluster_id, centroid, size) VALUES (%s, %s, %s, %s);",
+        [(column, cluster, centroid, int(size)) for cluster, (centroid, size) in enumerate(zip(centroids, sizes))]
+    )
+    write_cluster_assignments(cursor, column, app_ids, labels, similarities)
+    write_neighbor_lines(cursor, neighbor_lines(column, app_ids, neighbors))
+
+    neighbors_logger.info(
+        f"Built {column} neighbours for {len(app_ids)} games in {len(centroids)} clusters: "
+        f"load {loaded - start:.1f} s, k-means {clustered - loaded:.1f} s, search {searched - clustered:.1f} s, write {time.perf_counter() - searched:.1f} s."
+    )
+    return len(app_ids)
+
+def load_centroids(cursor, column):
+    cursor.execute("SELECT centroid FROM game_cluster_centroids WHERE vector_column = %s ORDER BY cluster_id;", (column,))
+    rows = cursor.fetchall()
+    return np.stack([row[0] for row in rows]) if rows else None
+
+def load_cluster_vectors(cursor, column, clusters, excluded_app_ids):
+    cursor.execute(f"""
+        SELECT c.app_id, c.cluster_id, g.{column}
+        FROM game_clusters c JOIN games g ON g.app_id = c.app_id
+        WHERE c.vector_column = %s AND c.cluster_id = ANY(%s) AND NOT (c.app_id = ANY(%s)) AND g.{column} IS NOT NULL;
+    """, (column, clusters, excluded_app_ids))
+    rows = cursor.fetchall()
+    if not rows:
+        return np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int64), np.zeros((0, VECTOR_SIZE), dtype = np.float32)
+    return (
+        np.array([row[0] for row in rows], dtype = np.int64),
+        np.array([row[1] for row in rows], dtype = np.int64),
+        normalize_rows(np.stack([row[2] for row in rows]))
+    )
+
+def neighbor_thresholds(cursor, column, app_ids, k):
+    cursor.execute("""
+        SELECT app_id, min(similarity) FROM game_neighbors
+        WHERE vector_column = %s AND app_id = ANY(%s) GROUP BY app_id HAVING count(*) >= %s;
+    """, (column, app_ids.tolist(), k))
+    rows = dict(cursor.fetchall())
+    return np.array([rows.get(app_id, -np.inf) for app_id in app_ids.tolist()], dtype = np.float32)
+
+def load_neighbor_lists(cursor, column, app_ids):
+    cursor.execute("""
+        SELECT app_id, neighbor_app_id, similarity FROM game_neighbors
+        WHERE vector_column = %s AND app_id = ANY(%s);
+    """, (column, app_ids))
+    lists = {}
+    for app_id, neighbor_app_id, similarity in cursor.fetchall():
+        lists.setdefault(app_id, {})[neighbor_app_id] = similarity
+    return lists
+
+def load_referencing_clusters(cursor, column, app_ids):
+    cursor.execute("""
+        SELECT DISTINCT n.app_id, c.cluster_id
+        FROM game_neighbors n LEFT JOIN game_clusters c ON c.app_id = n.app_id AND c.vector_column = n.vector_column
+        WHERE n.vector_column = %s AND n.neighbor_app_id = ANY(%s) AND NOT (n.app_id = ANY(%s));
+    """, (column, app_ids, app_ids))
+    rows = cursor.fetchall()
+    return [row[0] for row in rows], np.array([row[1] for row in rows if row[1] is not None], dtype = np.int64)
+
+def update_column_neighbors(cursor, column, app_ids, k = NEIGHBORS_PER_COLUMN, probes = CLUSTER_PROBES, workers = NEIGHBOR_WORKERS):
+    centroids = load_centroids(cursor, column)
+    if centroids is None:
+        neighbors_logger.warning(f"No clusters stored for {column}; run refresh_game_neighbors() before incremental updates.")
+        return 0
+    new_ids, new_matrix = load_column_vectors(cursor, column, app_ids)
+    if new_matrix is None:
+        return 0
+
+    new_labels, new_similarities = assign_clusters(new_matrix, centroids, workers)
+    routes = cluster_routes(centroids, probes)
+    referencing_ids, referencing_labels = load_referencing_clusters(cursor, column, new_ids.tolist())
+    query_labels = np.concatenate([new_labels, referencing_labels])
+    probed = np.unique(np.concatenate([routes[query_labels].ravel(), query_labels])).tolist()
+    old_ids, old_labels, old_matrix = load_cluster_vectors(cursor, column, probed, new_ids.tolist())
+
+    all_ids = np.concatenate([old_ids, new_ids])
+    labels = np.concatenate([old_labels, new_labels])
+    matrix = np.concatenate([old_matrix, new_matrix])
+    refilled = np.isin(old_ids, referencing_ids)
+    query_rows = np.concatenate([np.flatnonzero(refilled), np.arange(len(old_ids), len(all_ids))])
+    neighbors = routed_neighbors(matrix, labels, routes, query_rows, k, workers)
+
+    scores = old_matrix @ new_matrix.T
+    thresholds = neighbor_thresholds(cursor, column, old_ids, k)
+    stale = np.flatnonzero(~refilled & (scores > thresholds[:, None]).any(axis = 1))
+    lists = load_neighbor_lists(cursor, column, old_ids[stale].tolist())
+    updated = {}
+    for row in stale:
+        app_id = int(old_ids[row])
+        closer = np.flatnonzero(scores[row] > thresholds[row])
+        merged = lists.get(app_id, {})
+        merged.update({int(new_ids[position]): float(scores[row, position]) for position in closer})
+        updated[app_id] = sorted(merged.items(), key = lambda item: item[1], reverse = True)[:k]
+
+    lines = neighbor_lines(column, all_ids, neighbors)
+    for app_id, nearest in updated.items():
+        lines.extend(f"{app_id}\t{column}\t{rank}\t{neighbor}\t{similarity:.6g}\n" for rank, (neighbor, similarity) in enumerate(nearest, start = 1))
+
+    cursor.execute("DELETE FROM game_neighbors WHERE vector_column = %s AND app_id = ANY(%s);", (column, new_ids.tolist() + referencing_ids + list(updated)))
+    write_neighbor_lines(cursor, lines)
+    write_cluster_assignments(cursor, column, new_ids, new_labels, new_similarities)
+    cursor.execute("""
+        UPDATE game_cluster_centroids AS centroids SET size = counts.size
+        FROM (SELECT cluster_id, count(*) AS size FROM game_clusters WHERE vector_column = %s AND cluster_id = ANY(%s) GROUP BY cluster_id) AS counts
+        WHERE centroids.vector_column = %s AND centroids.cluster_id = counts.cluster_id;
+    """, (column, np.unique(new_labels).tolist(), column))
+
+    neighbors_logger.info(
+        f"Updated {column} neighbours for {len(new_ids)} games, refilled {int(refilled.sum())} lists that referenced them and re-ranked {len(updated)} of {len(old_ids)} games in {len(probed)} probed clusters. "
+        f"Games outside the probed clusters and the stored centroids are not updated until the next refresh_game_neighbors()."
+    )
+    return len(new_ids)
+
+def update_game_neighbors(app_ids, columns = None, k = NEIGHBORS_PER_COLUMN, probes = CLUSTER_PROBES, workers = NEIGHBOR_WORKERS):
+    app_ids = list(app_ids)
+    if not app_ids:
+        return 0
+    connection = get_connection()
+
+    try:
+        register_vector_loader(connection)
+        updated = 0
+        with connection.cursor(binary = True) as cursor:
+            for column in columns or NEIGHBOR_COLUMNS:
+                updated += update_column_neighbors(cursor, column, app_ids, k, probes, workers)
+        connection.commit()
+        return updated
+    except Exception as e:
+        connection.rollback()
+        neighbors_logger.error(f"Failed to update neighbours for {len(app_ids)} games: {e}")
+        raise
+    finally:
+        return_connection(connection)
+
+def refresh_game_neighbors(columns = None, k = NEIGHBORS_PER_COLUMN, cluster_count = None, probes = CLUSTER_PROBES, workers = NEIGHBOR_WORKERS):
+    owns_pool = not has_connection_pool()
+    if owns_pool:
+        create_connection_pool(minconn = 1, maxconn = 1)
+    connection = get_connection()
+
+    try:
+        register_vector_loader(connection)
+        neighbors_logger.info(f"Started rebuilding game neighbours with {workers} workers.")
+        for column in columns or NEIGHBOR_COLUMNS:
+            with connection.cursor(binary = True) as cursor:
+                build_column_neighbors(cursor, column, k, cluster_count, probes, workers)
+            connection.commit()
+        neighbors_logger.info("------------End of game neighbours rebuild------------\n")
+    except Exception as e:
+        connection.rollback()
+        neighbors_logger.error(f"Failed to rebuild game neighbours: {e}")
+        raise
+    finally:
+        return_connection(connection)
+        if owns_pool:
+            close_connection_pool()
+
+def neighbor_rows(cursor, app_id, columns, where = None, params = None):
+    query = sql.SQL(NEIGHBOR_ROWS_QUERY).format(where = where if where is not None else sql.SQL("TRUE"))
+    cursor.execute(query, dict(params or {}, app_id = app_id, columns = list(columns)))
+    return cursor.fetchall()
+
+if __name__ == "__main__":
+    refresh_game_neighbors()
@@ -0,0 +1,145 @@
+import numpy as np
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+from Scripts.SteamApi.vector_store import VECTOR_FIELDS, VECTOR_SIZE, load_part_vectors, app_id_rows, vectors_to_array
+from Scripts.Recommendation.vector_search import rrf_scores, COLUMN_WEIGHTS, CANDIDATES_PER_COLUMN, FUSION
+
+COLUMN_FIELDS = {
+    "features": "Features",
+    "detailed_description_vector": "Detailed Description Vector",
+    "about_the_game_vector": "About the Game Vector",
+    "short_description_vector": "Short Description Vector",
+    "metadata_vector": "Metadata Vector"
+}
+METADATA_FIELDS = {"game_name": "Game Name", "short_description": "Short Description", "price": "Price", "is_free": "Is Free"}
+DEQUANTIZE_BLOCK_ROWS = 32768
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis = -1, keepdims = True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def quantize_int8(matrix):
+    scales = np.abs(matrix).max(axis = 1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+def top_k(scores, k):
+    k = min(k, scores.shape[0])
+    if k == 0:
+        return np.zeros((0,) + scores.shape[1:], dtype = np.int64)
+    candidates = np.argpartition(-scores, k - 1, axis = 0)[:k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis = 0), axis = 0)
+    return np.take_along_axis(candidates, order, axis = 0)
+
+class InMemoryGameIndex:
+    def __init__(self, app_ids, matrices, metadata, quantization = None):
+        self.app_ids = np.asarray(app_ids, dtype = np.int64)
+        self.metadata = metadata
+        self.quantization = quantization
+        self.matrices = {}
+        self.scales = {}
+
+        for column, matrix in matrices.items():
+            matrix = normalize_rows(np.ascontiguousarray(matrix, dtype = np.float32))
+            if quantization == "int8":
+                self.matrices[column], self.scales[column] = quantize_int8(matrix)
+            else:
+                self.matrices[column] = matrix
+
+    @classmethod
+    def from_parts(cls, directory = DATA_DIR, columns = None, quantization = None):
+        columns = columns or list(COLUMN_FIELDS)
+        field_rows = [VECTOR_FIELDS.index(COLUMN_FIELDS[column]) for column in columns]
+        app_ids = []
+        metadata = []
+        blocks = []
+
+        for part_path in list_part_files(directory):
+            part_ids, part_vectors = load_part_vectors(part_path)
+            rows = app_id_rows(part_ids) if part_ids is not None else {}
+            part_blocks = []
+            for game in iter_part_records(part_path):
+                app_id = game.get("App ID")
+                row = rows.get(app_id)
+                if row is not None and VECTOR_FIELDS[1] not in game:
+                    vectors = np.asarray(part_vectors[row], dtype = np.float32)
+                else:
+                    vectors = vectors_to_array(game, np.float32)
+                part_blocks.append(vectors[field_rows])
+                app_ids.append(app_id)
+                metadata.append({column: game.get(field) for column, field in METADATA_FIELDS.items()})
+            if part_blocks:
+                blocks.append(np.stack(part_blocks))
+
+        stacked = np.concatenate(blocks) if blocks else np.zeros((0, len(columns), VECTOR_SIZE), dtype = np.float32)
+        matrices = {column: stacked[:, index, :] for index, column in enumerate(columns)}
+        return cls(app_ids, matrices, metadata, quantization)
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    def memory_bytes(self):
+        return sum(matrix.nbytes for matrix in self.matrices.values()) + sum(scales.nbytes for scales in self.scales.values())
+
+    def scores(self, column, queries):
+        matrix = self.matrices[column]
+        if self.quantization != "int8":
+            return matrix @ queries
+
+        scores = np.empty((matrix.shape[0], queries.shape[1]), dtype = np.float32)
+        for start in range(0, matrix.shape[0], DEQUANTIZE_BLOCK_ROWS):
+            block = matrix[start:start + DEQUANTIZE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + DEQUANTIZE_BLOCK_ROWS] = block @ queries
+        return scores * self.scales[column][:, None]
+
+    def prepare_queries(self, query_vectors):
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype = np.float32))[:, :VECTOR_SIZE]
+        return normalize_rows(queries).T
+
+    def search_batch(self, column, query_vectors, k = 10):
+        scores = self.scores(column, self.prepare_queries(query_vectors))
+        indices = top_k(scores, k)
+        return [
+            [(int(self.app_ids[row]), float(scores[row, query])) for row in indices[:, query]]
+            for query in range(scores.shape[1])
+        ]
+
+    def search(self, column, query_vector, k = 10):
+        return self.search_batch(column, [query_vector], k)[0]
+
+    def recommend_batch(self, query_vectors, k = 10, weights = None, candidates_per_column = CANDIDATES_PER_COLUMN, fusion = FUSION):
+        weights = {column: weight for column, weight in (weights or COLUMN_WEIGHTS).items() if weight > 0}
+        queries = self.prepare_queries(query_vectors)
+        similarities = {column: self.scores(column, queries) for column in weights}
+        candidates = {column: top_k(column_scores, max(k, candidates_per_column)) for column, column_scores in similarities.items()}
+
+        results = []
+        for query in range(queries.shape[1]):
+            rankings = {column: column_candidates[:, query].tolist() for column, column_candidates in candidates.items()}
+            rows = np.unique(np.concatenate([column_candidates[:, query] for column_candidates in candidates.values()]))
+            weighted = sum(weight * similarities[column][rows, query] for column, weight in weights.items())
+            if fusion == "rrf":
+                scores = rrf_scores(rankings, weights)
+                fused = np.array([scores.get(row, 0.0) for row in rows.tolist()])
+                order = np.lexsort((-weighted, -fused))[:k]
+            else:
+                fused = weighted
+                order = np.argsort(-fused)[:k]
+
+            query_results = []
+            for position in order:
+                row = rows[position]
+                result = {"app_id": int(self.app_ids[row])}
+                result.update(self.metadata[row])
+                result["score"] = float(fused[position])
+                result["similarities"] = {column: float(column_scores[row, query]) for column, column_scores in similarities.items()}
+                if fusion == "rrf":
+                    result["ranks"] = {column: row_ids.index(row) + 1 if row in row_ids else None for column, row_ids in rankings.items()}
+                query_results.append(result)
+            results.append(query_results)
+        return results
+
+    def recommend(self, query_vector, k = 10, weights = None, candidates_per_column = CANDIDATES_PER_COLUMN, fusion = FUSION):
+        return self.recommend_batch([query_vector], k, weights, candidates_per_column, fusion)[0]
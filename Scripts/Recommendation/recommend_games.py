@@ -0,0 +1,143 @@
+import os
+import time
+import logging
+from psycopg import sql
+
+from Scripts.Database.db_connection_pool import get_connection, return_connection
+from Scripts.Recommendation.embedding_service import get_embedding_service
+from Scripts.Recommendation.vector_search import knn_search, candidate_similarities, filter_conditions, rrf_scores, EF_SEARCH, COLUMN_WEIGHTS, CANDIDATES_PER_COLUMN, RRF_K, FUSION
+from Scripts.Recommendation.game_neighbors import neighbor_rows
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Recommendation'
+    os.makedirs(log_dir, exist_ok = True)
+    log_file_path = os.path.join(log_dir, 'recommendation.log')
+    logger = logging.getLogger(__name__)
+    handler = logging.FileHandler(log_file_path, encoding = 'utf-8')
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+recommendation_logger = setup_logger()
+
+def candidate_result(row, columns):
+    app_id, game_name, short_description, price, is_free, *similarities = row
+    return {
+        "app_id": app_id,
+        "game_name": game_name,
+        "short_description": short_description,
+        "price": float(price) if price is not None else None,
+        "is_free": is_free,
+        "similarities": {column: float(value) if value is not None else 0.0 for column, value in zip(columns, similarities)}
+    }
+
+def fuse_candidates(rows, weights):
+    columns = list(weights)
+    results = []
+    for row in rows:
+        result = candidate_result(row, columns)
+        result["score"] = sum(weights[column] * result["similarities"][column] for column in columns)
+        results.append(result)
+    results.sort(key = lambda result: result["score"], reverse = True)
+    return results
+
+def fuse_candidates_rrf(rows, rankings, weights, rrf_k = RRF_K):
+    columns = list(weights)
+    scores = rrf_scores(rankings, weights, rrf_k)
+    ranks = {column: {app_id: rank for rank, app_id in enumerate(app_ids, start = 1)} for column, app_ids in rankings.items()}
+    results = []
+    for row in rows:
+        result = candidate_result(row, columns)
+        result["score"] = scores.get(result["app_id"], 0.0)
+        result["ranks"] = {column: ranks[column].get(result["app_id"]) for column in rankings}
+        results.append(result)
+    results.sort(key = lambda result: (result["score"], sum(weights[column] * result["similarities"][column] for column in columns)), reverse = True)
+    return results
+
+def recommend_games_by_vector(query_vector, k = 10, weights = None, ef_search = EF_SEARCH, candidates_per_column = CANDIDATES_PER_COLUMN, filters = None, fusion = FUSION):
+    weights = weights or COLUMN_WEIGHTS
+    connection = get_connection()
+
+    try:
+        with connection.cursor() as cursor:
+            rankings = {}
+            for column, weight in weights.items():
+                if weight > 0:
+                    rankings[column] = [app_id for app_id, _ in knn_search(cursor, column, query_vector, max(k, candidates_per_column), ef_search, filters = filters)]
+
+            candidate_ids = {app_id for app_ids in rankings.values() for app_id in app_ids}
+            if not candidate_ids:
+                return []
+
+            rows = candidate_similarities(cursor, candidate_ids, query_vector, list(weights))
+        connection.commit()
+        if fusion == "rrf":
+            return fuse_candidates_rrf(rows, rankings, weights)[:k]
+        return fuse_candidates(rows, weights)[:k]
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        return_connection(connection)
+
+def recommend_games(query_text, k = 10, weights = None, ef_search = EF_SEARCH, candidates_per_column = CANDIDATES_PER_COLUMN, filters = None, fusion = FUSION):
+    start = time.perf_counter()
+    query_vector = get_embedding_service().embed(query_text)
+    embedded = time.perf_counter()
+
+    results = recommend_games_by_vector(query_vector, k, weights, ef_search, candidates_per_column, filters, fusion)
+    finished = time.perf_counter()
+
+    recommendation_logger.info(f"Query '{query_text[:80]}' with filters {filters or {}}: embed {(embedded - start) * 1000:.1f} ms, search {(finished - embedded) * 1000:.1f} ms, {len(results)} results.")
+    return results
+
+def fuse_neighbor_rows(rows, weights, rrf_k = RRF_K):
+    rankings = {}
+    results = {}
+    for column, rank, similarity, app_id, game_name, short_description, price, is_free in rows:
+        rankings.setdefault(column, []).append(app_id)
+        if app_id not in results:
+            results[app_id] = candidate_result((app_id, game_name, short_description, price, is_free), [])
+            results[app_id]["similarities"] = {column: 0.0 for column in weights}
+            results[app_id]["ranks"] = {column: None for column in weights}
+        results[app_id]["similarities"][column] = float(similarity)
+        results[app_id]["ranks"][column] = rank
+
+    scores = rrf_scores(rankings, weights, rrf_k)
+    for app_id, result in results.items():
+        result["score"] = scores.get(app_id, 0.0)
+    return sorted(results.values(), key = lambda result: (result["score"], sum(weights[column] * result["similarities"][column] for column in weights)), reverse = True)
+
+def recommend_similar_games(app_id, k = 10, weights = None, filters = None):
+    start = time.perf_counter()
+    weights = {column: weight for column, weight in (weights or COLUMN_WEIGHTS).items() if weight > 0}
+    conditions, params = filter_conditions(filters)
+    where = sql.SQL(" AND ").join(conditions) if conditions else None
+    connection = get_connection()
+
+    try:
+        with connection.cursor() as cursor:
+            rows = neighbor_rows(cursor, app_id, list(weights), where, params)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        return_connection(connection)
+
+    results = fuse_neighbor_rows(rows, weights)[:k]
+    recommendation_logger.info(f"Games similar to {app_id} with filters {filters or {}}: lookup {(time.perf_counter() - start) * 1000:.1f} ms, {len(results)} results.")
+    return results
+
+def recommend_games_in_memory(query_text, index, k = 10, weights = None, candidates_per_column = CANDIDATES_PER_COLUMN, fusion = FUSION):
+    start = time.perf_counter()
+    query_vector = get_embedding_service().embed(query_text)
+    embedded = time.perf_counter()
+
+    results = index.recommend(query_vector, k, weights, candidates_per_column, fusion)
+    finished = time.perf_counter()
+
+    recommendation_logger.info(f"In-memory query '{query_text[:80]}': embed {(embedded - start) * 1000:.1f} ms, search {(finished - embedded) * 1000:.1f} ms, {len(results)} results.")
+    return results
@@ -0,0 +1,131 @@
+import json
+from psycopg import sql
+
+from Scripts.Database.vector_adapter import vector_text
+
+VECTOR_SIZE = 768
+EF_SEARCH = 100
+SEARCH_COLUMNS = ["short_description_vector", "about_the_game_vector", "metadata_vector"]
+COLUMN_WEIGHTS = {
+    "short_description_vector": 0.4,
+    "about_the_game_vector": 0.3,
+    "metadata_vector": 0.3
+}
+CANDIDATES_PER_COLUMN = 50
+RRF_K = 60
+FUSION = "rrf"
+FILTERED_EF_SEARCH = 400
+ITERATIVE_SCAN_VERSION = (0, 8, 0)
+
+pgvector_version = None
+
+def rrf_scores(rankings, weights, rrf_k = RRF_K):
+    scores = {}
+    for column, app_ids in rankings.items():
+        for rank, app_id in enumerate(app_ids, start = 1):
+            scores[app_id] = scores.get(app_id, 0.0) + weights[column] / (rrf_k + rank)
+    return scores
+
+def vector_literal(vector):
+    return vector_text(vector)
+
+def set_ef_search(cursor, ef_search):
+    cursor.execute("SELECT set_config('hnsw.ef_search', %s, true);", (str(ef_search),))
+
+def supports_iterative_scan(cursor):
+    global pgvector_version
+    if pgvector_version is None:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector';")
+        row = cursor.fetchone()
+        pgvector_version = tuple(int(part) for part in row[0].split(".")[:3]) if row else (0, 0, 0)
+    return pgvector_version >= ITERATIVE_SCAN_VERSION
+
+def filter_conditions(filters):
+    conditions = []
+    params = {}
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name == "is_free":
+            conditions.append(sql.SQL("is_free" if value else "NOT is_free"))
+        elif name == "max_price":
+            conditions.append(sql.SQL("price <= %(max_price)s"))
+        elif name == "min_price":
+            conditions.append(sql.SQL("price >= %(min_price)s"))
+        elif name == "released_after":
+            conditions.append(sql.SQL("release_date >= %(released_after)s"))
+        elif name == "released_before":
+            conditions.append(sql.SQL("release_date <= %(released_before)s"))
+        elif name == "max_age_rating":
+            conditions.append(sql.SQL("age_rating <= %(max_age_rating)s"))
+        elif name == "genres":
+            conditions.append(sql.SQL("genres @> %(genres)s::jsonb"))
+            value = json.dumps([{"description": genre} for genre in value])
+        elif name == "tags":
+            conditions.append(sql.SQL("tags @> %(tags)s::jsonb"))
+            value = json.dumps(list(value))
+        else:
+            raise ValueError(f"Unknown recommendation filter: {name}")
+        if name != "is_free":
+            params[name] = value
+    return conditions, params
+
+def search_conditions(column, filters):
+    conditions, params = filter_conditions(filters)
+    conditions.insert(0, sql.SQL("{column} IS NOT NULL").format(column = sql.Identifier(column)))
+    return sql.SQL(" AND ").join(conditions), params
+
+def filtered_exact_search(cursor, column, query_vector, k, filters):
+    where, params = search_conditions(column, filters)
+    query = sql.SQL("""
+        WITH filtered AS MATERIALIZED (
+            SELECT app_id, {column} AS vector FROM games WHERE {where}
+        )
+        SELECT app_id, 1 - (vector <=> %(query)s::vector) AS similarity
+        FROM filtered
+        ORDER BY vector <=> %(query)s::vector
+        LIMIT %(k)s;
+    """).format(column = sql.Identifier(column), where = where)
+    cursor.execute(query, dict(params, query = vector_literal(query_vector), k = k))
+    return cursor.fetchall()
+
+def knn_search(cursor, column, query_vector, k, ef_search = EF_SEARCH, exact = False, filters = None):
+    if exact:
+        cursor.execute("SET LOCAL enable_indexscan = off;")
+    elif filters and supports_iterative_scan(cursor):
+        cursor.execute("SET LOCAL hnsw.iterative_scan = strict_order;")
+        set_ef_search(cursor, ef_search)
+    elif filters:
+        set_ef_search(cursor, max(ef_search, FILTERED_EF_SEARCH))
+    else:
+        set_ef_search(cursor, ef_search)
+
+    where, params = search_conditions(column, filters)
+    query = sql.SQL("""
+        SELECT app_id, 1 - ({column} <=> %(query)s::vector) AS similarity
+        FROM games
+        WHERE {where}
+        ORDER BY {column} <=> %(query)s::vector
+        LIMIT %(k)s;
+    """).format(column = sql.Identifier(column), where = where)
+    cursor.execute(query, dict(params, query = vector_literal(query_vector), k = k))
+    rows = cursor.fetchall()
+
+    if exact:
+        cursor.execute("SET LOCAL enable_indexscan = on;")
+    elif filters and len(rows) < k:
+        rows = filtered_exact_search(cursor, column, query_vector, k, filters)
+    return rows
+
+def candidate_similarities(cursor, app_ids, query_vector, columns):
+    similarity_columns = sql.SQL(", ").join(
+        sql.SQL("1 - ({column} <=> %(query)s::vector)").format(column = sql.Identifier(column))
+        for column in columns
+    )
+    query = sql.SQL("""
+        SELECT app_id, game_name, short_description, price, is_free, {similarities}
+        FROM games
+        WHERE app_id = ANY(%(app_ids)s);
+    """).format(similarities = similarity_columns)
+    cursor.execute(query, {"query": vector_literal(query_vector), "app_ids": list(app_ids)})
+    return cursor.fetchall()
@@ -1,39 +1,71 @@
 import os
-import json
-import requests
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def get_app_id_by_name(game_name):
-    file_path = os.path.join('../GameRecommendation/Data/BaseList', 'steam_game_list_base.json')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.SteamApi.steam_client import get_steam_client
+from Scripts.SteamApi.app_name_index import get_app_name_index
+
+PLAYER_COUNT_URL = 'http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}'
+PLAYER_COUNT_TTL = 60
+PLAYER_COUNT_WORKERS = 8
 
-    if not os.path.exists(file_path):
-        print(f"Error: The file '{file_path}' does not exist.")
-        return None
+player_counts = {}
+player_counts_lock = threading.Lock()
 
-    with open(file_path, 'r', encoding = 'utf-8') as file:
-        games_data = json.load(file)
+def get_app_id_by_name(game_name):
+    app_id = get_app_name_index().lookup(game_name)
+    if app_id is None:
+        print(f"Game '{game_name}' not found in the database.")
+    return app_id
 
-        for game in games_data:
-            if game_name.lower() == game['name'].lower():
-                return game['appid']
+def fetch_player_count(app_id):
+    player_count_response = get_steam_client().get(PLAYER_COUNT_URL.format(app_id = app_id), "current_players")
+    player_count_data = player_count_response.json()
 
-    print(f"Game '{game_name}' not found in the database.")
+    if 'response' in player_count_data and 'player_count' in player_count_data['response']:
+        return player_count_data['response']['player_count']
     return None
 
+def get_player_count(app_id, ttl = PLAYER_COUNT_TTL):
+    now = time.monotonic()
+    with player_counts_lock:
+        cached = player_counts.get(app_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        player_count = fetch_player_count(app_id)
+    except Exception:
+        player_count = None
+    if player_count is not None:
+        with player_counts_lock:
+            player_counts[app_id] = (now + ttl, player_count)
+    return player_count
+
+def get_player_counts(game_names, max_workers = PLAYER_COUNT_WORKERS):
+    app_ids = get_app_name_index().lookup_many(game_names)
+    found = sorted({app_id for app_id in app_ids.values() if app_id is not None})
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        counts = dict(zip(found, executor.map(get_player_count, found)))
+
+    return {name: counts.get(app_id) if app_id is not None else None for name, app_id in app_ids.items()}
+
 def active_players(game_name):
     app_id = get_app_id_by_name(game_name)
 
     if app_id:
-        player_count_url = f'http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}'
-        
-        player_count_response = requests.get(player_count_url)
-        player_count_data = player_count_response.json()
-
-        if 'response' in player_count_data and 'player_count' in player_count_data['response']:
-            player_count = player_count_data['response']['player_count']
+        player_count = get_player_count(app_id)
+        if player_count is not None:
             print(f"Current number of players in {game_name}: {player_count}")
         else:
             print("Failed to retrieve player count.")
     else:
         print(f"Game '{game_name}' not found in the database.")
 
-active_players("The Witcher 3 REDkit")
+if __name__ == "__main__":
+    active_players("The Witcher 3 REDkit")
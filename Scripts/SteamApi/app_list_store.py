@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+STORE_PATH = '../GameRecommendation/Data/BaseList/app_list.sqlite'
+LEGACY_BASE_LIST_PATH = '../GameRecommendation/Data/BaseList/steam_game_list_base.json'
+CHANGE_HISTORY_SYNCS = 30
+
+def app_entry(game):
+    if isinstance(game, dict):
+        return int(game['appid']), game.get('name') or ""
+    return int(game[0]), game[1] or ""
+
+class AppListStore:
+    def __init__(self, path = STORE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        self.path = path
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, timeout = 30, isolation_level = None, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS apps (
+                appid INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_changed REAL NOT NULL
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS app_list_syncs (
+                sync_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                synced_at REAL NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                added INTEGER NOT NULL DEFAULT 0,
+                removed INTEGER NOT NULL DEFAULT 0,
+                renamed INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS app_list_changes (
+                sync_id INTEGER NOT NULL,
+                appid INTEGER NOT NULL,
+                change TEXT NOT NULL,
+                name TEXT,
+                PRIMARY KEY (sync_id, change, appid)
+            ) WITHOUT ROWID
+        """)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS app_list_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (appid INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+
+    def count(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+
+    def sync(self, games):
+        now = time.time()
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.execute("DELETE FROM incoming")
+                self.connection.executemany("INSERT OR REPLACE INTO incoming (appid, name) VALUES (?, ?)", (app_entry(game) for game in games))
+
+                sync_id = self.connection.execute("INSERT INTO app_list_syncs (synced_at) VALUES (?)", (now,)).lastrowid
+                self.connection.execute(
+                    "INSERT INTO app_list_changes (sync_id, appid, change, name) "
+                    "SELECT ?, appid, 'added', name FROM incoming WHERE appid NOT IN (SELECT appid FROM apps)",
+                    (sync_id,)
+                )
+                self.connection.execute(
+                    "INSERT INTO app_list_changes (sync_id, appid, change, name) "
+                    "SELECT ?, appid, 'removed', name FROM apps WHERE appid NOT IN (SELECT appid FROM incoming)",
+                    (sync_id,)
+                )
+                self.connection.execute(
+                    "INSERT INTO app_list_changes (sync_id, appid, change, name) "
+                    "SELECT ?, incoming.appid, 'renamed', incoming.name FROM incoming JOIN apps ON apps.appid = incoming.appid WHERE apps.name != incoming.name",
+                    (sync_id,)
+                )
+
+                self.connection.execute(
+                    "DELETE FROM apps WHERE appid IN (SELECT appid FROM app_list_changes WHERE sync_id = ? AND change = 'removed')",
+                    (sync_id,)
+                )
+                self.connection.execute(
+                    "UPDATE apps SET name = (SELECT name FROM app_list_changes WHERE sync_id = ? AND change = 'renamed' AND appid = apps.appid), last_changed = ? "
+                    "WHERE appid IN (SELECT appid FROM app_list_changes WHERE sync_id = ? AND change = 'renamed')",
+                    (sync_id, now, sync_id)
+                )
+                self.connection.execute(
+                    "INSERT INTO apps (appid, name, first_seen, last_changed) "
+                    "SELECT appid, name, ?, ? FROM app_list_changes WHERE sync_id = ? AND change = 'added'",
+                    (now, now, sync_id)
+                )
+
+                counts = dict(self.connection.execute(
+                    "SELECT change, COUNT(*) FROM app_list_changes WHERE sync_id = ? GROUP BY change", (sync_id,)
+                ).fetchall())
+                total = self.connection.execute("SELECT COUNT(*) FROM incoming").fetchone()[0]
+                self.connection.execute(
+                    "UPDATE app_list_syncs SET total = ?, added = ?, removed = ?, renamed = ? WHERE sync_id = ?",
+                    (total, counts.get("added", 0), counts.get("removed", 0), counts.get("renamed", 0), sync_id)
+                )
+                self.connection.execute(
+                    "DELETE FROM app_list_changes WHERE sync_id <= ?",
+                    (sync_id - CHANGE_HISTORY_SYNCS,)
+                )
+                self.connection.execute("DELETE FROM incoming")
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+        return {
+            "sync_id": sync_id,
+            "total": total,
+            "added": counts.get("added", 0),
+            "removed": counts.get("removed", 0),
+            "renamed": counts.get("renamed", 0)
+        }
+
+    def changes(self, sync_id, change):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT appid, name FROM app_list_changes WHERE sync_id = ? AND change = ? ORDER BY appid",
+                (sync_id, change)
+            ).fetchall()
+        return [{"appid": appid, "name": name} for appid, name in rows]
+
+    def iter_apps(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT appid, name FROM apps ORDER BY appid").fetchall()
+        for appid, name in rows:
+            yield {"appid": appid, "name": name}
+
+    def migrate_legacy_base_list(self, path = LEGACY_BASE_LIST_PATH):
+        with self.lock:
+            migrated = self.connection.execute("SELECT value FROM app_list_meta WHERE key = 'legacy_base_list_migrated'").fetchone()
+        if migrated or not os.path.exists(path):
+            return 0
+
+        with open(path, 'r', encoding = 'utf-8') as f:
+            content = f.read().strip()
+        result = self.sync(json.loads(content) if content else [])
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO app_list_meta (key, value) VALUES ('legacy_base_list_migrated', ?)",
+                (f"{path} ({result['total']} app ids)",)
+            )
+        return result['total']
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,135 @@
+import os
+import json
+import sqlite3
+import threading
+
+from Scripts.SteamApi.app_list_store import AppListStore, STORE_PATH
+
+BASE_LIST_PATH = '../GameRecommendation/Data/BaseList/steam_game_list_base.json'
+INDEX_PATH = '../GameRecommendation/Data/BaseList/app_name_index.sqlite'
+PREFIX_LIMIT = 10
+SEARCH_LIMIT = 10
+
+def normalize_name(name):
+    return (name or "").strip().lower()
+
+def fts_query(text):
+    terms = ['"' + term.replace('"', '""') + '"' for term in normalize_name(text).split()]
+    if not terms:
+        return None
+    terms[-1] += "*"
+    return " ".join(terms)
+
+def build_app_name_index(games, path = INDEX_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    temp_path = path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("CREATE TABLE apps (position INTEGER PRIMARY KEY, appid INTEGER NOT NULL, name TEXT NOT NULL, name_lower TEXT NOT NULL)")
+        connection.executemany(
+            "INSERT INTO apps (position, appid, name, name_lower) VALUES (?, ?, ?, ?)",
+            ((position, game['appid'], game.get('name') or "", normalize_name(game.get('name'))) for position, game in enumerate(games))
+        )
+        connection.execute("CREATE INDEX apps_name_lower ON apps (name_lower, position)")
+        connection.execute("CREATE VIRTUAL TABLE apps_fts USING fts5 (name_lower, content = 'apps', content_rowid = 'position')")
+        connection.execute("INSERT INTO apps_fts (rowid, name_lower) SELECT position, name_lower FROM apps")
+        connection.execute("ANALYZE")
+        connection.commit()
+        count = connection.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+    finally:
+        connection.close()
+
+    os.replace(temp_path, path)
+    return count
+
+def build_index_from_store(store_path = STORE_PATH, path = INDEX_PATH):
+    if not os.path.exists(store_path):
+        return 0
+    store = AppListStore(store_path)
+    try:
+        return build_app_name_index(store.iter_apps(), path) if store.count() else 0
+    finally:
+        store.close()
+
+def build_index_from_base_list(base_list_path = BASE_LIST_PATH, path = INDEX_PATH):
+    if not os.path.exists(base_list_path):
+        return 0
+    with open(base_list_path, 'r', encoding = 'utf-8') as f:
+        return build_app_name_index(json.load(f), path)
+
+class AppNameIndex:
+    def __init__(self, path = INDEX_PATH, base_list_path = BASE_LIST_PATH, store_path = STORE_PATH):
+        self.path = path
+        self.base_list_path = base_list_path
+        self.store_path = store_path
+        self.connection = None
+        self.loaded = None
+        self.lock = threading.Lock()
+
+    def open(self):
+        if not os.path.exists(self.path):
+            if not build_index_from_store(self.store_path, self.path):
+                build_index_from_base_list(self.base_list_path, self.path)
+        if not os.path.exists(self.path):
+            return None
+
+        modified = os.path.getmtime(self.path)
+        if self.connection is None or self.loaded != modified:
+            if self.connection is not None:
+                self.connection.close()
+            self.connection = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri = True, check_same_thread = False)
+            self.connection.execute("PRAGMA mmap_size = 268435456")
+            self.loaded = modified
+        return self.connection
+
+    def query(self, statement, params):
+        with self.lock:
+            connection = self.open()
+            if connection is None:
+                return []
+            return connection.execute(statement, params).fetchall()
+
+    def lookup(self, name):
+        rows = self.query("SELECT appid FROM apps WHERE name_lower = ? ORDER BY position LIMIT 1", (normalize_name(name),))
+        return rows[0][0] if rows else None
+
+    def lookup_many(self, names):
+        return {name: self.lookup(name) for name in names}
+
+    def prefix(self, prefix, limit = PREFIX_LIMIT):
+        prefix = normalize_name(prefix)
+        return self.query(
+            "SELECT appid, name FROM apps WHERE name_lower >= ? AND name_lower < ? ORDER BY name_lower, position LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)
+        )
+
+    def search(self, text, limit = SEARCH_LIMIT):
+        match = fts_query(text)
+        if match is None:
+            return []
+        return self.query(
+            "SELECT apps.appid, apps.name FROM apps_fts JOIN apps ON apps.position = apps_fts.rowid "
+            "WHERE apps_fts MATCH ? ORDER BY bm25(apps_fts), length(apps.name_lower), apps.position LIMIT ?",
+            (match, limit)
+        )
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+app_name_index = None
+
+def get_app_name_index():
+    global app_name_index
+    if app_name_index is None:
+        app_name_index = AppNameIndex()
+    return app_name_index
@@ -0,0 +1,35 @@
+import json
+import hashlib
+
+HASH_GROUPS = {
+    "detailed_description": (["Detailed Description"], ["detailed_description", "detailed_description_vector"]),
+    "about_the_game": (["About the Game"], ["about_the_game", "about_the_game_vector"]),
+    "short_description": (["Short Description"], ["short_description", "short_description_vector"]),
+    "metadata": (["Tags", "Genres", "Categories"], ["tags", "genres", "categories", "metadata_vector"]),
+    "features": (["Tags", "Genres", "Recommendations"], ["recommendations", "features"]),
+    "details": (
+        ["Game Name", "Type", "Developer", "Publisher", "Is Free", "Price", "Age Rating", "Minimum Requirements", "Recommended Requirements", "Release Date"],
+        ["game_name", "type", "developer", "publisher", "is_free", "price", "age_rating", "minimum_requirements", "recommended_requirements", "release_date", "release_date_days"]
+    )
+}
+TEXT_VECTOR_GROUPS = ["detailed_description", "about_the_game", "short_description", "metadata"]
+ALL_GROUPS = frozenset(HASH_GROUPS)
+
+def field_hash(values):
+    payload = json.dumps(values, sort_keys = True, ensure_ascii = False, default = str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size = 8).hexdigest()
+
+def content_hashes(game_data):
+    return {group: field_hash([game_data.get(field) for field in fields]) for group, (fields, _) in HASH_GROUPS.items()}
+
+def changed_groups(stored_hashes, new_hashes):
+    if not stored_hashes:
+        return ALL_GROUPS
+    return frozenset(group for group, value in new_hashes.items() if stored_hashes.get(group) != value)
+
+def changed_columns(groups):
+    columns = []
+    for group in HASH_GROUPS:
+        if group in groups:
+            columns.extend(column for column in HASH_GROUPS[group][1] if column not in columns)
+    return columns
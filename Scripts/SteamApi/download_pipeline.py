@@ -0,0 +1,271 @@
+import os
+import time
+import queue
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from Scripts.SteamApi.steam_fetch import iter_app_data, STORE_API_BASE_URL, STORE_PAGE_BASE_URL
+from Scripts.SteamApi.game_details import build_game_details
+from Scripts.SteamApi.game_data_to_vector import game_data_to_vector_batch, embedding_cache_stats, EMBEDDING_BATCH_SIZE
+from Scripts.SteamApi.language_filter import get_language_filter
+from Scripts.Database.insert_data_to_database import insert_data_bulk
+from Scripts.Recommendation.game_neighbors import update_game_neighbors
+
+FETCH_CONCURRENCY = 8
+REQUESTS_PER_SECOND = 2.0
+PROCESS_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PROCESS_IN_FLIGHT = 32
+EMBED_QUEUE_SIZE = 256
+WRITE_QUEUE_SIZE = 8
+BATCH_TIMEOUT = 2.0
+REPORT_INTERVAL = 30.0
+
+download_logger = logging.getLogger('download_logger')
+
+def configure_worker_logging(log_path):
+    if log_path and not download_logger.handlers:
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        download_logger.addHandler(handler)
+        download_logger.setLevel(logging.INFO)
+        download_logger.propagate = False
+
+def worker_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def process_game(app_id, details, tags):
+    game = build_game_details(app_id, details, tags)
+    return game, os.getpid(), get_language_filter().stats()
+
+def combine_language_filter_stats(worker_stats):
+    combined = {}
+    for stats in worker_stats:
+        for key, value in stats.items():
+            if key.endswith("_per_game"):
+                combined[key] = combined.get(key, 0.0) + value * stats["games"]
+            elif isinstance(value, (int, float)):
+                combined[key] = combined.get(key, 0) + value
+            else:
+                combined.setdefault(key, value)
+    for key in combined:
+        if key.endswith("_per_game"):
+            combined[key] = combined[key] / combined["games"] if combined.get("games") else 0.0
+    return combined
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def record(self, items, seconds, dropped = 0):
+        with self.lock:
+            self.items += items
+            self.dropped += dropped
+            self.busy_seconds += seconds
+
+    def summary(self):
+        with self.lock:
+            elapsed = max(time.perf_counter() - self.started, 1e-9)
+            return {
+                "items": self.items,
+                "dropped": self.dropped,
+                "items_per_second": self.items / elapsed,
+                "busy_seconds": self.busy_seconds
+            }
+
+def collect_batch(source, batch_size, timeout = BATCH_TIMEOUT):
+    item = source.get()
+    if item is None:
+        return [], True
+
+    batch = [item]
+    deadline = time.monotonic() + timeout
+    while len(batch) < batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = source.get(timeout = remaining)
+        except queue.Empty:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+class DownloadPipeline:
+    def __init__(self, work_queue, worker_id, vocabulary, part_writer, should_stop, total_inserted_counter,
+                 max_iterations = 90000, concurrency = FETCH_CONCURRENCY, requests_per_second = REQUESTS_PER_SECOND,
+                 process_workers = PROCESS_WORKERS, embedding_batch_size = EMBEDDING_BATCH_SIZE, worker_log_path = None,
+                 api_base_url = STORE_API_BASE_URL, page_base_url = STORE_PAGE_BASE_URL):
+        self.work_queue = work_queue
+        self.worker_id = worker_id
+        self.vocabulary = vocabulary
+        self.part_writer = part_writer
+        self.should_stop = should_stop
+        self.total_inserted_counter = total_inserted_counter
+        self.max_iterations = max_iterations
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.process_workers = process_workers
+        self.embedding_batch_size = embedding_batch_size
+        self.worker_log_path = worker_log_path
+        self.api_base_url = api_base_url
+        self.page_base_url = page_base_url
+
+        self.embed_queue = queue.Queue(maxsize = EMBED_QUEUE_SIZE)
+        self.write_queue = queue.Queue(maxsize = WRITE_QUEUE_SIZE)
+        self.stages = {name: StageStats(name) for name in ("fetch", "process", "embed", "write")}
+        self.max_depths = {"embed_queue": 0, "write_queue": 0}
+        self.language_filter_stats = {}
+        self.finished = threading.Event()
+
+    def scheduled_app_ids(self):
+        scheduled = 0
+        while scheduled < self.max_iterations:
+            leased = self.work_queue.lease(self.worker_id, min(self.concurrency, self.max_iterations - scheduled))
+            if not leased:
+                return
+            for index, game in enumerate(leased):
+                if self.should_stop():
+                    self.work_queue.release([g['appid'] for g in leased[index:]])
+                    download_logger.info('Stop requested. Draining the pipeline before exiting...')
+                    return
+                scheduled += 1
+                yield game['appid']
+
+    def put_blocking(self, target, item, name):
+        target.put(item)
+        self.max_depths[name] = max(self.max_depths[name], target.qsize())
+
+    async def fetch_and_process(self, process_pool):
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(PROCESS_IN_FLIGHT)
+        tasks = set()
+
+        async def process(app_id, details, tags):
+            start = time.perf_counter()
+            try:
+                game, worker_pid, filter_stats = await loop.run_in_executor(process_pool, process_game, app_id, details, tags)
+                self.language_filter_stats[worker_pid] = filter_stats
+            except Exception as e:
+                download_logger.error(f"Failed to process app_id: {app_id} - {e}")
+                self.stages["process"].record(0, time.perf_counter() - start, 1)
+                self.work_queue.release([app_id])
+                in_flight.release()
+                return
+            self.stages["process"].record(1 if game else 0, time.perf_counter() - start, 0 if game else 1)
+
+            try:
+                if game:
+                    await asyncio.to_thread(self.put_blocking, self.embed_queue, (app_id, game), "embed_queue")
+                else:
+                    self.work_queue.ack([app_id])
+            finally:
+                in_flight.release()
+
+        fetch_started = time.perf_counter()
+        async for app_id, details, tags in iter_app_data(self.scheduled_app_ids(), concurrency = self.concurrency, requests_per_second = self.requests_per_second, api_base_url = self.api_base_url, page_base_url = self.page_base_url):
+            self.stages["fetch"].record(1, time.perf_counter() - fetch_started)
+            await in_flight.acquire()
+            task = asyncio.create_task(process(app_id, details, tags))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            fetch_started = time.perf_counter()
+
+        await asyncio.gather(*tasks)
+
+    def embed_stage(self):
+        finished = False
+        while not finished:
+            batch, finished = collect_batch(self.embed_queue, self.embedding_batch_size)
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            app_ids = [app_id for app_id, _ in batch]
+            try:
+                processed_games = game_data_to_vector_batch([game for _, game in batch], self.vocabulary)
+                self.vocabulary.save_if_changed()
+            except Exception as e:
+                download_logger.error(f"Failed to vectorize batch of {len(batch)} games - {e}")
+                self.stages["embed"].record(0, time.perf_counter() - start, len(batch))
+                self.work_queue.release(app_ids)
+                continue
+            self.stages["embed"].record(len(processed_games), time.perf_counter() - start, len(batch) - len(processed_games))
+            self.put_blocking(self.write_queue, (app_ids, processed_games), "write_queue")
+        self.write_queue.put(None)
+
+    def write_stage(self):
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                return
+
+            app_ids, processed_games = item
+            start = time.perf_counter()
+            try:
+                if processed_games:
+                    self.part_writer.append_many(processed_games)
+                    success_count, error_count = insert_data_bulk(processed_games, silent = True, strict = True)
+                    self.total_inserted_counter[0] += success_count
+                    if error_count:
+                        download_logger.error(f"Failed to insert {error_count} games into the database.")
+            except Exception as e:
+                download_logger.error(f"Failed to store batch of {len(processed_games)} games - {e}. Returning {len(app_ids)} app ids to the queue.")
+                self.work_queue.release(app_ids)
+                self.stages["write"].record(0, time.perf_counter() - start, len(processed_games))
+                continue
+            self.work_queue.ack(app_ids)
+
+            if processed_games:
+                try:
+                    update_game_neighbors([game['App ID'] for game in processed_games])
+                except Exception as e:
+                    download_logger.error(f"Failed to update neighbours for {len(processed_games)} games - {e}")
+            self.stages["write"].record(len(processed_games), time.perf_counter() - start)
+
+    def stats(self):
+        summary = {name: stage.summary() for name, stage in self.stages.items()}
+        summary["queue_depth"] = {
+            "embed_queue": self.embed_queue.qsize(),
+            "write_queue": self.write_queue.qsize(),
+            "max_embed_queue": self.max_depths["embed_queue"],
+            "max_write_queue": self.max_depths["write_queue"]
+        }
+        summary["language_filter"] = combine_language_filter_stats(list(self.language_filter_stats.values()))
+        summary["embedding_cache"] = embedding_cache_stats()
+        return summary
+
+    def report_stage_stats(self):
+        while not self.finished.wait(REPORT_INTERVAL):
+            download_logger.info(f"Pipeline stats: {self.stats()}")
+
+    def run(self):
+        process_pool = ProcessPoolExecutor(max_workers = self.process_workers, mp_context = worker_context(), initializer = configure_worker_logging, initargs = (self.worker_log_path,))
+        embed_thread = threading.Thread(target = self.embed_stage, name = "pipeline-embed", daemon = True)
+        write_thread = threading.Thread(target = self.write_stage, name = "pipeline-write", daemon = True)
+        report_thread = threading.Thread(target = self.report_stage_stats, name = "pipeline-report", daemon = True)
+        for thread in (embed_thread, write_thread, report_thread):
+            thread.start()
+
+        try:
+            with process_pool:
+                asyncio.run(self.fetch_and_process(process_pool))
+        finally:
+            self.embed_queue.put(None)
+            embed_thread.join()
+            write_thread.join()
+            self.finished.set()
+            report_thread.join()
+
+        download_logger.info(f"Pipeline stats: {self.stats()}")
+        return self.stats()
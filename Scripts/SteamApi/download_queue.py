@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+
+QUEUE_PATH = '../GameRecommendation/Data/DownloadList/download_queue.sqlite'
+LEGACY_LIST_PATH = '../GameRecommendation/Data/DownloadList/steam_game_list_to_update.json'
+LEASE_SECONDS = 900
+SQLITE_VARIABLE_LIMIT = 900
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def queue_entry(game):
+    if isinstance(game, dict):
+        return int(game['appid']), game.get('name')
+    return int(game), None
+
+class DownloadQueue:
+    def __init__(self, path = QUEUE_PATH, lease_seconds = LEASE_SECONDS):
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, timeout = 30, isolation_level = None, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS queue (
+                app_id INTEGER PRIMARY KEY,
+                name TEXT,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS queue_status_position ON queue (status, position)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS queue_meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def enqueue_many(self, games):
+        entries = [queue_entry(game) for game in games]
+        if not entries:
+            return 0
+
+        now = time.time()
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                position = self.connection.execute("SELECT COALESCE(MAX(position), 0) FROM queue").fetchone()[0]
+                before = self.connection.total_changes
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO queue (app_id, name, position, enqueued_at) VALUES (?, ?, ?, ?)",
+                    [(app_id, name, position + offset, now) for offset, (app_id, name) in enumerate(entries, start = 1)]
+                )
+                added = self.connection.total_changes - before
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return added
+
+    def enqueue(self, game):
+        return self.enqueue_many([game])
+
+    def recover_expired_leases(self):
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE queue SET status = 'pending', lease_owner = NULL, lease_expires = NULL WHERE status = 'leased' AND lease_expires < ?",
+                (time.time(),)
+            )
+        return cursor.rowcount
+
+    def lease(self, owner = None, count = 1):
+        owner = owner or default_worker_id()
+        now = time.time()
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.execute(
+                    "UPDATE queue SET status = 'pending', lease_owner = NULL, lease_expires = NULL WHERE status = 'leased' AND lease_expires < ?",
+                    (now,)
+                )
+                rows = self.connection.execute(
+                    "SELECT app_id, name FROM queue WHERE status = 'pending' ORDER BY position LIMIT ?",
+                    (count,)
+                ).fetchall()
+                self.connection.executemany(
+                    "UPDATE queue SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE app_id = ?",
+                    [(owner, now + self.lease_seconds, app_id) for app_id, _ in rows]
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return [{"appid": app_id, "name": name} for app_id, name in rows]
+
+    def ack(self, app_ids):
+        self.execute_for_ids("DELETE FROM queue WHERE app_id IN ({})", app_ids)
+
+    def release(self, app_ids):
+        self.execute_for_ids("UPDATE queue SET status = 'pending', lease_owner = NULL, lease_expires = NULL WHERE app_id IN ({})", app_ids)
+
+    def execute_for_ids(self, query, app_ids):
+        app_ids = [int(app_id) for app_id in app_ids]
+        with self.lock:
+            for start in range(0, len(app_ids), SQLITE_VARIABLE_LIMIT):
+                chunk = app_ids[start:start + SQLITE_VARIABLE_LIMIT]
+                self.connection.execute(query.format(",".join("?" * len(chunk))), chunk)
+
+    def pending_count(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM queue WHERE status = 'pending'").fetchone()[0]
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.connection.execute("SELECT status, COUNT(*) FROM queue GROUP BY status").fetchall())
+        return {"pending": counts.get("pending", 0), "leased": counts.get("leased", 0)}
+
+    def migrate_legacy_list(self, path = LEGACY_LIST_PATH):
+        with self.lock:
+            migrated = self.connection.execute("SELECT value FROM queue_meta WHERE key = 'legacy_list_migrated'").fetchone()
+        if migrated or not os.path.exists(path):
+            return 0
+
+        with open(path, 'r', encoding = 'utf-8') as f:
+            content = f.read().strip()
+        added = self.enqueue_many(json.loads(content) if content else [])
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO queue_meta (key, value) VALUES ('legacy_list_migrated', ?)",
+                (f"{path} ({added} app ids)",)
+            )
+        return added
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
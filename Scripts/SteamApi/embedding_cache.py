@@ -0,0 +1,137 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+
+CACHE_PATH = "Data/EmbeddingCache/embeddings.sqlite"
+MEMORY_CACHE_SIZE = 20000
+MAX_DISK_ENTRIES = 1000000
+EVICTION_RATIO = 0.9
+SQLITE_VARIABLE_LIMIT = 900
+
+def normalize_text(text):
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+def cache_key(model_name, text):
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    def __init__(self, model_name, path = CACHE_PATH, memory_size = MEMORY_CACHE_SIZE, max_entries = MAX_DISK_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        self.model_name = model_name
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self.connection.commit()
+        self.disk_entries = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def remember(self, key, vector):
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last = False)
+
+    def lookup(self, texts):
+        found = {}
+        keys = {text: cache_key(self.model_name, text) for text in texts}
+
+        with self.lock:
+            disk_keys = {}
+            for text, key in keys.items():
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[text] = self.memory[key]
+                    self.memory_hits += 1
+                else:
+                    disk_keys.setdefault(key, []).append(text)
+
+            key_list = list(disk_keys)
+            now = time.time()
+            for start in range(0, len(key_list), SQLITE_VARIABLE_LIMIT):
+                chunk = key_list[start:start + SQLITE_VARIABLE_LIMIT]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype = np.float32)
+                    self.remember(key, vector)
+                    for text in disk_keys.pop(key):
+                        found[text] = vector
+                        self.disk_hits += 1
+                if rows:
+                    self.connection.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key, _ in rows])
+
+            if key_list:
+                self.connection.commit()
+
+            missing = [text for texts_for_key in disk_keys.values() for text in texts_for_key]
+            self.misses += len(missing)
+
+        return found, missing
+
+    def store(self, vectors_by_text):
+        if not vectors_by_text:
+            return
+
+        now = time.time()
+        rows = []
+        with self.lock:
+            for text, vector in vectors_by_text.items():
+                key = cache_key(self.model_name, text)
+                vector = np.asarray(vector, dtype = np.float32)
+                self.remember(key, vector)
+                rows.append((key, vector.tobytes(), now))
+
+            before = self.connection.total_changes
+            self.connection.executemany("INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+            self.disk_entries += self.connection.total_changes - before
+
+            if self.disk_entries > self.max_entries:
+                self.evict(self.disk_entries - int(self.max_entries * EVICTION_RATIO))
+            self.connection.commit()
+
+    def evict(self, count):
+        deleted = self.connection.execute("""
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY last_used LIMIT ?
+            )
+        """, (count,)).rowcount
+        self.disk_entries -= deleted
+        self.evictions += deleted
+
+    def stats(self):
+        with self.lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "disk_entries": self.disk_entries,
+                "evictions": self.evictions
+            }
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
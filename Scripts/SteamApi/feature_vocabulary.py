@@ -0,0 +1,82 @@
+import os
+import json
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+
+VOCABULARY_PATH = "Data/Vocabulary/feature_vocabulary.json"
+VECTOR_SIZE = 768
+RECOMMENDATIONS_COLUMN = VECTOR_SIZE - 1
+
+def game_genres(game_data):
+    return [genre.get("description", "") for genre in game_data.get("Genres", []) if genre.get("description")]
+
+class FeatureVocabulary:
+    def __init__(self, tags = None, genres = None, version = 0, path = VOCABULARY_PATH):
+        self.tags = dict(tags or {})
+        self.genres = dict(genres or {})
+        self.version = version
+        self.path = path
+        self.changed = False
+
+    @property
+    def size(self):
+        return len(self.tags) + len(self.genres)
+
+    def add(self, columns, name):
+        if name in columns:
+            return
+        columns[name] = self.size
+        self.version += 1
+        self.changed = True
+
+    def update_from_game(self, game_data):
+        for tag in game_data.get("Tags", []):
+            self.add(self.tags, tag)
+        for genre in game_genres(game_data):
+            self.add(self.genres, genre)
+
+    def update_from_games(self, games):
+        for game_data in games:
+            self.update_from_game(game_data)
+
+    def columns_for_game(self, game_data):
+        columns = [self.tags[tag] for tag in game_data.get("Tags", []) if tag in self.tags]
+        columns.extend(self.genres[genre] for genre in game_genres(game_data) if genre in self.genres)
+        return [column for column in columns if column < RECOMMENDATIONS_COLUMN]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding = "utf-8") as f:
+            json.dump({"version": self.version, "tags": self.tags, "genres": self.genres}, f, ensure_ascii = False, indent = 4)
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+    def save_if_changed(self):
+        if self.changed:
+            self.save()
+
+def build_feature_vocabulary(directory = DATA_DIR, path = VOCABULARY_PATH):
+    all_tags = set()
+    all_genres = set()
+    for part_file in list_part_files(directory):
+        for game_data in iter_part_records(part_file):
+            all_tags.update(game_data.get("Tags", []))
+            all_genres.update(game_genres(game_data))
+
+    vocabulary = FeatureVocabulary(path = path)
+    for tag in sorted(all_tags):
+        vocabulary.add(vocabulary.tags, tag)
+    for genre in sorted(all_genres):
+        vocabulary.add(vocabulary.genres, genre)
+    return vocabulary
+
+def load_feature_vocabulary(path = VOCABULARY_PATH, directory = DATA_DIR):
+    if os.path.exists(path):
+        with open(path, "r", encoding = "utf-8") as f:
+            data = json.load(f)
+        return FeatureVocabulary(data.get("tags"), data.get("genres"), data.get("version", 0), path)
+
+    vocabulary = build_feature_vocabulary(directory, path)
+    vocabulary.save()
+    return vocabulary
@@ -1,30 +1,46 @@
+import torch
 import numpy as np
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
+from Scripts.SteamApi.embedding_cache import EmbeddingCache
+from Scripts.SteamApi.feature_vocabulary import RECOMMENDATIONS_COLUMN
+from Scripts.SteamApi.content_hashes import content_hashes, TEXT_VECTOR_GROUPS
 
-model = SentenceTransformer("BAAI/bge-base-en-v1.5")
+MODEL_NAME = "BAAI/bge-base-en-v1.5"
+EMBEDDING_CACHE_ENABLED = True
+
+model = None
+embedding_cache = EmbeddingCache(MODEL_NAME) if EMBEDDING_CACHE_ENABLED else None
 
 VECTOR_SIZE = 768
+EMBEDDING_BATCH_SIZE = 64
+TEXT_VECTOR_FIELDS = [
+    ("Detailed Description Vector", "Detailed Description"),
+    ("About the Game Vector", "About the Game"),
+    ("Short Description Vector", "Short Description")
+]
+
+def get_model():
+    global model
+    if model is None:
+        model = SentenceTransformer(MODEL_NAME)
+    return model
 
 def round_vector(vector, precision = 4, target_length = VECTOR_SIZE):
-    rounded = [round(x, precision) for x in vector]
-    if len(rounded) > target_length:
-        return rounded[:target_length]
-    elif len(rounded) < target_length:
-        return rounded + [0.0] * (target_length - len(rounded))
+    vector = np.asarray(vector, dtype = np.float64).ravel()[:target_length]
+    rounded = np.zeros(target_length, dtype = np.float32)
+    rounded[:len(vector)] = np.round(vector, precision)
     return rounded
 
-def generate_feature_vector(game_data, all_tags, all_genres):
-    tag_vector = np.zeros(len(all_tags))
-    for tag in game_data.get("Tags", []):
-        if tag in all_tags:
-            tag_vector[all_tags.index(tag)] = 1
+def round_vectors(vectors, precision = 4, target_length = VECTOR_SIZE):
+    matrix = np.asarray(vectors, dtype = np.float64)[:, :target_length]
+    rounded = np.zeros((len(matrix), target_length), dtype = np.float32)
+    rounded[:, :matrix.shape[1]] = np.round(matrix, precision)
+    return rounded
 
-    genre_vector = np.zeros(len(all_genres))
-    for genre in game_data.get("Genres", []):
-        genre_description = genre.get("description", "")
-        if genre_description in all_genres:
-            genre_vector[all_genres.index(genre_description)] = 1
+def generate_feature_vector(game_data, vocabulary):
+    feature_vector = np.zeros(VECTOR_SIZE, dtype = np.float32)
+    feature_vector[vocabulary.columns_for_game(game_data)] = 1.0
 
     recommendations = game_data.get("Recommendations", 0)
     try:
@@ -32,8 +48,8 @@ def generate_feature_vector(game_data, all_tags, all_genres):
     except (ValueError, TypeError):
         recommendations_normalized = 0
 
-    feature_vector = np.concatenate([tag_vector, genre_vector, [recommendations_normalized]])
-    return round_vector(feature_vector, precision = 4, target_length = VECTOR_SIZE)
+    feature_vector[RECOMMENDATIONS_COLUMN] = round(recommendations_normalized, 4)
+    return feature_vector
 
 def process_release_date(date_str):
     if not date_str:
@@ -53,8 +69,7 @@ def process_release_date(date_str):
     return date_str, None
 
 def process_text_to_vector(text):
-    vector = model.encode(text).tolist()
-    return round_vector(vector, precision = 4, target_length = VECTOR_SIZE)
+    return encode_texts([text])[0]
 
 def create_metadata_string(game_data):
     tags = ", ".join(game_data.get("Tags", []))
@@ -62,16 +77,41 @@ def create_metadata_string(game_data):
     categories = ", ".join([c.get("description", "") for c in game_data.get("Categories", [])])
     return f"Tags: {tags}. Genres: {genres}. Categories: {categories}."
 
-def game_data_to_vector(game_data, all_tags, all_genres):
+def encode_texts(texts, batch_size = EMBEDDING_BATCH_SIZE, use_disk_cache = True):
+    unique_texts = list(dict.fromkeys(texts))
+    if embedding_cache and use_disk_cache:
+        vectors_by_text, missing_texts = embedding_cache.lookup(unique_texts)
+    else:
+        vectors_by_text, missing_texts = {}, unique_texts
+
+    if missing_texts:
+        missing_texts.sort(key = len, reverse = True)
+        new_vectors = dict(zip(missing_texts, get_model().encode(missing_texts, batch_size = batch_size)))
+        vectors_by_text.update(new_vectors)
+        if embedding_cache and use_disk_cache:
+            embedding_cache.store(new_vectors)
+
+    rounded = round_vectors([vectors_by_text[text] for text in unique_texts], precision = 4, target_length = VECTOR_SIZE)
+    encoded = dict(zip(unique_texts, rounded))
+    return [encoded[text] for text in texts]
+
+def embedding_cache_stats():
+    return embedding_cache.stats() if embedding_cache else {}
+
+def game_texts(game_data):
+    texts = [game_data.get(field, "") or "" for _, field in TEXT_VECTOR_FIELDS]
+    texts.append(create_metadata_string(game_data))
+    return texts
+
+def build_processed_game(game_data, text_vectors, vocabulary, with_features = True):
     processed_game = game_data.copy()
+    processed_game["Content Hashes"] = content_hashes(game_data)
 
-    processed_game["Features"] = generate_feature_vector(game_data, all_tags, all_genres)
-    processed_game["Detailed Description Vector"] = process_text_to_vector(game_data.get("Detailed Description", ""))
-    processed_game["About the Game Vector"] = process_text_to_vector(game_data.get("About the Game", ""))
-    processed_game["Short Description Vector"] = process_text_to_vector(game_data.get("Short Description", ""))
-
-    metadata_text = create_metadata_string(game_data)
-    processed_game["Metadata Vector"] = process_text_to_vector(metadata_text)
+    if with_features:
+        processed_game["Features"] = generate_feature_vector(game_data, vocabulary)
+    for vector_field, vector in zip([field for field, _ in TEXT_VECTOR_FIELDS] + ["Metadata Vector"], text_vectors):
+        if vector is not None:
+            processed_game[vector_field] = vector
 
     try:
         price_value = game_data.get("Price")
@@ -85,4 +125,48 @@ def game_data_to_vector(game_data, all_tags, all_genres):
     processed_game["Release Date"] = release_date
     processed_game["Release Date Days"] = release_date_days
 
-    return processed_game
\ No newline at end of file
+    return processed_game
+
+def game_data_to_vector_batch(games, vocabulary, batch_size = EMBEDDING_BATCH_SIZE, num_threads = None):
+    if not games:
+        return []
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    vocabulary.update_from_games(games)
+
+    texts_per_game = len(TEXT_VECTOR_FIELDS) + 1
+    texts = [text for game_data in games for text in game_texts(game_data)]
+    vectors = encode_texts(texts, batch_size = batch_size)
+
+    return [
+        build_processed_game(game_data, vectors[index * texts_per_game:(index + 1) * texts_per_game], vocabulary)
+        for index, game_data in enumerate(games)
+    ]
+
+def game_data_to_vector_changed(games, groups_per_game, vocabulary, batch_size = EMBEDDING_BATCH_SIZE):
+    if not games:
+        return []
+
+    vocabulary.update_from_games(games)
+
+    slots = [
+        (index, slot, text)
+        for index, game_data in enumerate(games)
+        for slot, text in enumerate(game_texts(game_data))
+        if TEXT_VECTOR_GROUPS[slot] in groups_per_game[index]
+    ]
+    vectors = encode_texts([text for _, _, text in slots], batch_size = batch_size) if slots else []
+
+    text_vectors = [[None] * len(TEXT_VECTOR_GROUPS) for _ in games]
+    for (index, slot, _), vector in zip(slots, vectors):
+        text_vectors[index][slot] = vector
+
+    return [
+        build_processed_game(game_data, text_vectors[index], vocabulary, with_features = "features" in groups_per_game[index])
+        for index, game_data in enumerate(games)
+    ]
+
+def game_data_to_vector(game_data, vocabulary):
+    return game_data_to_vector_batch([game_data], vocabulary)[0]
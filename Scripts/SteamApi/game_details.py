@@ -0,0 +1,69 @@
+import logging
+
+from Scripts.SteamApi.steam_fetch import get_steam_tags
+from Scripts.SteamApi.text_cleaning import clean_game_text
+from Scripts.SteamApi.language_filter import get_language_filter
+
+download_logger = logging.getLogger('download_logger')
+
+def build_game_details(app_id, details, tags = None):
+    if not (details and details.get('type') == 'game'):
+        download_logger.warning(f"Failed to fetch details or object is not a game: app_id: {app_id}")
+        return None
+
+    download_logger.info(f"Processed game: {details.get('name', 'No name')} (app_id: {app_id})")
+
+    detailed_description = details.get('detailed_description', '')
+    short_description = details.get('short_description', '')
+    about_game = details.get('about_the_game', '')
+
+    if not get_language_filter().is_english_game(details):
+        download_logger.info(f"Skipping app_id: {app_id} because description is not in English.")
+        return None
+
+    is_free = details.get('is_free', False)
+    price_overview = details.get('price_overview', {})
+    price = price_overview.get('final_formatted', 'N/A') if price_overview else 'N/A'
+
+    pc_requirements = 'No information'
+    pc_requirements_data = details.get('pc_requirements', [])
+    pc_requirements = pc_requirements_data[0] if isinstance(pc_requirements_data, list) and pc_requirements_data else pc_requirements
+
+    minimal_requirements = 'No information'
+    recommended_requirements = 'No information'
+
+    if isinstance(pc_requirements, dict):
+        minimal_requirements = pc_requirements.get('minimum', 'No information')
+        recommended_requirements = pc_requirements.get('recommended', 'No information')
+
+    metacritic_score = details.get('metacritic', {}).get('score', 'No Information')
+    recommendations_total = details.get('recommendations', {}).get('total', 'No Information')
+    release_date_info = details.get('release_date', {})
+    release_date = release_date_info.get('date', 'No Information') if release_date_info else 'No Information'
+
+    if tags is None:
+        tags = get_steam_tags(app_id)
+
+    game_details = {
+        'App ID': app_id,
+        'Game Name': details['name'],
+        'Type': details['type'],
+        'Developer': details.get('developers', ['No Information']),
+        'Publisher': details.get('publishers', ['No Information']),
+        'Is Free': is_free,
+        'Price': price,
+        'Age Rating': details.get('required_age', 'N/A'),
+        'Detailed Description': detailed_description,
+        'Short Description': short_description,
+        'About the Game': about_game,
+        'Minimum Requirements': minimal_requirements,
+        'Recommended Requirements': recommended_requirements,
+        'Metacritic': metacritic_score,
+        'Categories': details.get('categories', []),
+        'Tags': tags,
+        'Genres': details.get('genres', []),
+        'Recommendations': recommendations_total,
+        'Release Date': release_date
+    }
+
+    return clean_game_text(game_details)
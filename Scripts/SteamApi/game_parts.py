@@ -0,0 +1,32 @@
+import os
+import re
+import gzip
+import json
+from glob import glob
+
+DATA_DIR = "Data/GamesData"
+PART_BASE_NAME = "steam_games_processed_vector_part"
+PART_FILE_PATTERN = re.compile(r"steam_games_processed_vector_part(\d+)\.(jsonl|gz)$")
+
+def part_number(path):
+    match = PART_FILE_PATTERN.search(os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+def list_part_files(directory = DATA_DIR):
+    paths = [
+        path for path in glob(os.path.join(directory, f"{PART_BASE_NAME}*"))
+        if PART_FILE_PATTERN.search(os.path.basename(path))
+    ]
+    return sorted(paths, key = lambda path: (part_number(path), path.endswith(".jsonl")))
+
+def open_part_file(path, mode = "rt"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding = "utf-8")
+    return open(path, mode.replace("t", ""), encoding = "utf-8")
+
+def iter_part_records(path):
+    with open_part_file(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line and line not in ("[", "]"):
+                yield json.loads(line)
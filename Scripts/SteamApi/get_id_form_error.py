@@ -1,11 +1,11 @@
 import re
 import os
-import json
 
-def get_id_from_error():
+from download_queue import DownloadQueue
+
+def get_id_from_error(work_queue = None):
     app_ids = []
     log_file_path = '../GameRecommendation/Logs/Download/error_id.log'
-    output_json_path = '../GameRecommendation/Data/DownloadList/steam_game_list_to_update.json'
     
     if os.path.getsize(log_file_path) == 0:
         print("Plik error_id.log is empty. End of a script.")
@@ -27,27 +27,12 @@ def get_id_from_error():
             app_id_error = error_match.group(1)
             app_ids.append({"appid": int(app_id_error)})
 
-    if os.path.exists(output_json_path):
-        with open(output_json_path, 'r+', encoding = 'utf-8') as json_file:
-            content = json_file.read().strip()
-            
-            if content == "[]" or not content:
-                json_file.seek(0)
-                json_file.truncate()
-                json.dump(app_ids, json_file, indent = 4)
-            else:
-                json_file.seek(0, os.SEEK_END)
-                json_file.seek(json_file.tell() - 1, os.SEEK_SET)
-                json_file.truncate()
-                
-                app_ids_str = json.dumps(app_ids, indent = 4)[1:-1]
-                
-                json_file.write(", ")
-                json_file.write(app_ids_str)
-                json_file.write("\n]")
-    else:
-        with open(output_json_path, 'w', encoding = 'utf-8') as json_file:
-            json.dump(app_ids, json_file, indent = 4)
+    queue = work_queue or DownloadQueue()
+    try:
+        added = queue.enqueue_many(app_ids)
+    finally:
+        if work_queue is None:
+            queue.close()
 
     open(log_file_path, 'w').close()
-    print("All errors were processed and added to steam_game_list_to_update.json file")
+    print(f"All errors were processed and {added} app ids were added to the download queue")
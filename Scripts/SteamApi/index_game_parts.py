@@ -0,0 +1,35 @@
+import os
+import sys
+import logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files
+from Scripts.SteamApi.vector_store import convert_part
+from Scripts.SteamApi.part_index import index_part
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Vectorize'
+    os.makedirs(log_dir, exist_ok = True)
+    logger = logging.getLogger(__name__)
+    handler = logging.FileHandler(os.path.join(log_dir, 'index_game_parts.log'), encoding = 'utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+index_logger = setup_logger()
+
+def index_game_parts(directory = DATA_DIR):
+    for path in list_part_files(directory):
+        if not path.endswith(".gz"):
+            continue
+        convert_part(path)
+        size_before = os.path.getsize(path)
+        count = index_part(path)
+        if count == 0:
+            index_logger.info(f"Skipping {path}, block index already present or part is empty.")
+            continue
+        index_logger.info(f"Rewrote {path} as {count} records in seekable blocks: {size_before} bytes -> {os.path.getsize(path)} bytes.")
+
+index_game_parts()
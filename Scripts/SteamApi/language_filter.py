@@ -0,0 +1,142 @@
+import re
+import time
+import threading
+from functools import lru_cache
+from langdetect import detect, DetectorFactory
+
+from Scripts.SteamApi.text_cleaning import remove_html_tags
+
+DetectorFactory.seed = 0
+
+LANGUAGE_BACKEND = "langdetect"
+FASTTEXT_MODEL_PATH = "Data/Models/lid.176.ftz"
+MAX_SAMPLE_CHARS = 1000
+MIN_LETTERS = 20
+MIN_LATIN_RATIO = 0.5
+MIN_STOPWORD_RATIO = 0.12
+DETECTION_CACHE_SIZE = 4096
+GAME_TEXT_FIELDS = ['short_description', 'about_the_game', 'detailed_description', 'name']
+
+ENGLISH_STOPWORDS = frozenset([
+    "the", "and", "of", "to", "a", "in", "is", "you", "your", "with", "for", "on", "that", "this",
+    "it", "as", "are", "be", "by", "an", "from", "or", "can", "will", "all", "at", "into", "their"
+])
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+def detect_langdetect(text):
+    return detect(text)
+
+def load_langid():
+    import langid
+    return lambda text: langid.classify(text)[0]
+
+def load_fasttext():
+    import fasttext
+    model = fasttext.load_model(FASTTEXT_MODEL_PATH)
+    return lambda text: model.predict(text.replace("\n", " "))[0][0].replace("__label__", "")
+
+BACKEND_LOADERS = {
+    "langdetect": lambda: detect_langdetect,
+    "langid": load_langid,
+    "fasttext": load_fasttext
+}
+
+def load_backend(name = LANGUAGE_BACKEND):
+    try:
+        return name, BACKEND_LOADERS[name]()
+    except Exception:
+        return "langdetect", detect_langdetect
+
+def text_sample(text, max_chars = MAX_SAMPLE_CHARS):
+    return remove_html_tags((text or "")[:max_chars * 2])[:max_chars]
+
+def script_precheck(sample):
+    letters = [char for char in sample if char.isalpha()]
+    if len(letters) < MIN_LETTERS:
+        return None
+
+    latin = sum(1 for char in letters if char.isascii())
+    if latin / len(letters) < MIN_LATIN_RATIO:
+        return False
+
+    words = WORD_PATTERN.findall(sample.lower())
+    if words and sum(1 for word in words if word in ENGLISH_STOPWORDS) / len(words) >= MIN_STOPWORD_RATIO:
+        return True
+    return None
+
+class LanguageFilter:
+    def __init__(self, backend = LANGUAGE_BACKEND, max_sample_chars = MAX_SAMPLE_CHARS):
+        self.backend_name, backend = load_backend(backend)
+        self.max_sample_chars = max_sample_chars
+        self.lock = threading.Lock()
+        self.games = 0
+        self.texts = 0
+        self.precheck_accepted = 0
+        self.precheck_rejected = 0
+        self.detector_calls = 0
+        self.detector_seconds = 0.0
+        self.filter_seconds = 0.0
+        self.skipped_chars = 0
+        self.detect_cached = lru_cache(maxsize = DETECTION_CACHE_SIZE)(self.make_detector(backend))
+
+    def make_detector(self, backend):
+        def detect_language(sample):
+            start = time.perf_counter()
+            try:
+                return backend(sample)
+            except Exception:
+                return None
+            finally:
+                with self.lock:
+                    self.detector_calls += 1
+                    self.detector_seconds += time.perf_counter() - start
+        return detect_language
+
+    def is_english(self, text):
+        sample = text_sample(text, self.max_sample_chars)
+        with self.lock:
+            self.texts += 1
+            self.skipped_chars += len(text or "") - len(sample)
+        if not sample:
+            return False
+
+        decision = script_precheck(sample)
+        if decision is not None:
+            with self.lock:
+                if decision:
+                    self.precheck_accepted += 1
+                else:
+                    self.precheck_rejected += 1
+            return decision
+
+        return self.detect_cached(sample) == 'en'
+
+    def is_english_game(self, details):
+        start = time.perf_counter()
+        result = any(self.is_english(details.get(field, '')) for field in GAME_TEXT_FIELDS)
+        with self.lock:
+            self.games += 1
+            self.filter_seconds += time.perf_counter() - start
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {
+                "backend": self.backend_name,
+                "games": self.games,
+                "texts": self.texts,
+                "precheck_accepted": self.precheck_accepted,
+                "precheck_rejected": self.precheck_rejected,
+                "detector_calls": self.detector_calls,
+                "detector_ms_per_game": self.detector_seconds / self.games * 1000 if self.games else 0.0,
+                "filter_ms_per_game": self.filter_seconds / self.games * 1000 if self.games else 0.0,
+                "truncated_chars": self.skipped_chars
+            }
+
+language_filter = None
+
+def get_language_filter():
+    global language_filter
+    if language_filter is None:
+        language_filter = LanguageFilter()
+    return language_filter
@@ -0,0 +1,138 @@
+import os
+import gzip
+import json
+import zlib
+import threading
+import numpy as np
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+from Scripts.SteamApi.vector_store import part_stem, load_part_vectors, attach_vectors
+
+BLOCK_RECORDS = 64
+COMPRESS_LEVEL = 6
+INDEX_EXTENSION = ".idx"
+INDEX_DTYPE = np.dtype([("app_id", np.int64), ("offset", np.int64), ("length", np.int32), ("line", np.int32)])
+
+def index_path(part_path):
+    return part_stem(part_path) + INDEX_EXTENSION
+
+def has_part_index(part_path):
+    return os.path.exists(index_path(part_path))
+
+def record_app_id(line):
+    return int(json.loads(line).get("App ID", -1))
+
+def iter_record_lines(path):
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip().rstrip(b",")
+            if line and line not in (b"[", b"]"):
+                yield line + b"\n"
+
+def write_block_gzip(lines, output_path, block_records = BLOCK_RECORDS):
+    temp_path = output_path + ".tmp"
+    temp_index_path = index_path(output_path) + ".tmp"
+    entries = []
+    block = []
+
+    with open(temp_path, "wb") as output_file:
+        def write_block():
+            data = b"".join(block)
+            member = gzip.compress(data, compresslevel = COMPRESS_LEVEL, mtime = 0)
+            offset = output_file.tell()
+            output_file.write(member)
+            for line_number, line in enumerate(block):
+                entries.append((record_app_id(line), offset, len(member), line_number))
+            block.clear()
+
+        for line in lines:
+            block.append(line)
+            if len(block) >= block_records:
+                write_block()
+        if block:
+            write_block()
+
+    np.array(entries, dtype = INDEX_DTYPE).tofile(temp_index_path)
+    os.replace(temp_path, output_path)
+    os.replace(temp_index_path, index_path(output_path))
+    return len(entries)
+
+def index_part(part_path, block_records = BLOCK_RECORDS):
+    if has_part_index(part_path) or not part_path.endswith(".gz"):
+        return 0
+
+    lines = ((json.dumps(game, ensure_ascii = False) + "\n").encode("utf-8") for game in iter_part_records(part_path))
+    return write_block_gzip(lines, part_path, block_records)
+
+def load_part_index(part_path):
+    if not has_part_index(part_path):
+        return None
+    return np.fromfile(index_path(part_path), dtype = INDEX_DTYPE)
+
+def read_indexed_record(part_path, offset, length, line):
+    with open(part_path, "rb") as f:
+        f.seek(offset)
+        data = zlib.decompress(f.read(length), 16 + zlib.MAX_WBITS)
+    return json.loads(data.split(b"\n")[line])
+
+class GameRecordIndex:
+    def __init__(self, directory = DATA_DIR):
+        self.directory = directory
+        self.entries = {}
+        self.loaded = {}
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            for path in list_part_files(self.directory):
+                if not has_part_index(path):
+                    continue
+                modified = os.path.getmtime(index_path(path))
+                if self.loaded.get(path) == modified:
+                    continue
+                for app_id, offset, length, line in load_part_index(path).tolist():
+                    self.entries[app_id] = (path, offset, length, line)
+                self.loaded[path] = modified
+
+    def locate(self, app_id):
+        location = self.entries.get(int(app_id))
+        if location is None or not os.path.exists(location[0]):
+            self.refresh()
+            location = self.entries.get(int(app_id))
+        return location
+
+def attach_part_vectors(game, part_path):
+    app_ids, vectors = load_part_vectors(part_path)
+    if app_ids is None:
+        return game
+    rows = np.flatnonzero(app_ids == game.get("App ID"))
+    if len(rows):
+        attach_vectors(game, vectors[rows[-1]])
+    return game
+
+def scan_unindexed_parts(app_id, directory = DATA_DIR):
+    for path in reversed(list_part_files(directory)):
+        if has_part_index(path):
+            continue
+        for game in iter_part_records(path):
+            if game.get("App ID") == app_id:
+                return path, game
+    return None, None
+
+record_indexes = {}
+
+def read_game_record(app_id, directory = DATA_DIR, with_vectors = True):
+    index = record_indexes.get(directory)
+    if index is None:
+        index = record_indexes.setdefault(directory, GameRecordIndex(directory))
+
+    location = index.locate(app_id)
+    if location is not None:
+        path, offset, length, line = location
+        game = read_indexed_record(path, offset, length, line)
+    else:
+        path, game = scan_unindexed_parts(int(app_id), directory)
+        if game is None:
+            return None
+
+    return attach_part_vectors(game, path) if with_vectors else game
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+import numpy as np
+
+from Scripts.SteamApi.game_parts import DATA_DIR, PART_BASE_NAME, list_part_files, part_number
+from Scripts.SteamApi.vector_store import VECTOR_DTYPE, ID_DTYPE, split_vectors, vectors_path, ids_path, merge_vector_stores
+from Scripts.SteamApi.part_index import iter_record_lines, write_block_gzip
+
+PART_LIMIT = 2000
+MERGE_THRESHOLD = 3
+FSYNC_INTERVAL = 5.0
+
+download_logger = logging.getLogger('download_logger')
+
+def count_lines(path):
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+def part_path(directory, index, extension = ".jsonl"):
+    return os.path.join(directory, f"{PART_BASE_NAME}{index}{extension}")
+
+def compact_parts(part_paths, directory = DATA_DIR):
+    merged_path = part_path(directory, part_number(part_paths[0]), ".gz")
+    lines = (line for path in part_paths for line in iter_record_lines(path))
+    write_block_gzip(lines, merged_path)
+
+    merge_vector_stores(part_paths, merged_path)
+    for path in part_paths:
+        os.remove(path)
+    return merged_path
+
+class RollingPartWriter:
+    def __init__(self, directory = DATA_DIR, part_limit = PART_LIMIT, merge_threshold = MERGE_THRESHOLD, fsync_interval = FSYNC_INTERVAL, dtype = VECTOR_DTYPE):
+        os.makedirs(directory, exist_ok = True)
+        self.directory = directory
+        self.part_limit = part_limit
+        self.merge_threshold = merge_threshold
+        self.fsync_interval = fsync_interval
+        self.dtype = dtype
+        self.lock = threading.Lock()
+        self.full_parts = []
+        self.handles = []
+        self.current_path = None
+        self.line_count = 0
+        self.last_fsync = time.monotonic()
+        self.written = 0
+        self.compacted = 0
+
+        self.compaction_queue = queue.Queue()
+        self.compactor = threading.Thread(target = self.run_compactor, name = "part-compactor", daemon = True)
+        self.compactor.start()
+
+        self.next_index = self.scan_existing_parts()
+        self.schedule_compaction()
+
+    def scan_existing_parts(self):
+        part_files = list_part_files(self.directory)
+        numbers = [part_number(path) for path in part_files]
+
+        for path in part_files:
+            if not path.endswith(".jsonl"):
+                continue
+            lines = count_lines(path)
+            if lines >= self.part_limit:
+                self.full_parts.append(path)
+            elif self.current_path is None:
+                self.open_part(path, lines)
+
+        return max(numbers) + 1 if numbers else 0
+
+    def open_part(self, path, lines = 0):
+        self.current_path = path
+        self.line_count = lines
+        self.handles = [
+            open(path, "ab"),
+            open(vectors_path(path, self.dtype), "ab"),
+            open(ids_path(path), "ab")
+        ]
+
+    def open_next_part(self):
+        self.open_part(part_path(self.directory, self.next_index))
+        self.next_index += 1
+
+    def sync(self, force = False):
+        for handle in self.handles:
+            handle.flush()
+        if force or time.monotonic() - self.last_fsync >= self.fsync_interval:
+            for handle in self.handles:
+                os.fsync(handle.fileno())
+            self.last_fsync = time.monotonic()
+
+    def close_current(self):
+        if self.handles:
+            self.sync(force = True)
+            for handle in self.handles:
+                handle.close()
+        self.handles = []
+        self.current_path = None
+        self.line_count = 0
+
+    def append(self, game):
+        metadata, vectors = split_vectors(game, self.dtype)
+        line = (json.dumps(metadata, ensure_ascii = False) + "\n").encode("utf-8")
+
+        with self.lock:
+            if self.current_path is None:
+                self.open_next_part()
+
+            metadata_file, vectors_file, ids_file = self.handles
+            vectors_file.write(np.ascontiguousarray(vectors, dtype = self.dtype).tobytes())
+            ids_file.write(np.asarray([game['App ID']], dtype = ID_DTYPE).tobytes())
+            metadata_file.write(line)
+            self.line_count += 1
+            self.written += 1
+
+            if self.line_count >= self.part_limit:
+                self.full_parts.append(self.current_path)
+                self.close_current()
+                self.schedule_compaction()
+            else:
+                self.sync()
+
+    def append_many(self, games):
+        for game in games:
+            self.append(game)
+
+    def schedule_compaction(self):
+        while len(self.full_parts) >= self.merge_threshold:
+            self.compaction_queue.put(self.full_parts[:self.merge_threshold])
+            self.full_parts = self.full_parts[self.merge_threshold:]
+
+    def run_compactor(self):
+        while True:
+            part_paths = self.compaction_queue.get()
+            try:
+                if part_paths is None:
+                    return
+                merged_path = compact_parts(part_paths, self.directory)
+                self.compacted += len(part_paths)
+                download_logger.info(f"Compacted {len(part_paths)} parts into {merged_path}")
+            except Exception as e:
+                download_logger.error(f"Failed to compact parts {part_paths} - {e}")
+            finally:
+                self.compaction_queue.task_done()
+
+    def stats(self):
+        return {
+            "current_part": self.current_path,
+            "current_lines": self.line_count,
+            "written": self.written,
+            "compacted_parts": self.compacted,
+            "pending_compactions": self.compaction_queue.qsize()
+        }
+
+    def close(self):
+        with self.lock:
+            self.close_current()
+        self.compaction_queue.put(None)
+        self.compactor.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
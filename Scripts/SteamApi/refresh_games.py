@@ -0,0 +1,173 @@
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.SteamApi.steam_fetch import iter_app_data
+from Scripts.SteamApi.game_details import build_game_details
+from Scripts.SteamApi.feature_vocabulary import load_feature_vocabulary
+from Scripts.SteamApi.content_hashes import content_hashes, changed_groups, changed_columns, TEXT_VECTOR_GROUPS
+from Scripts.SteamApi.game_data_to_vector import game_data_to_vector_changed, embedding_cache_stats
+from Scripts.Database.db_connection_pool import create_connection_pool, close_connection_pool, get_connection, return_connection
+from Scripts.Database.insert_data_to_database import insert_data_bulk, update_changed_columns
+from Scripts.Recommendation.game_neighbors import update_game_neighbors, refresh_game_neighbors
+
+REFRESH_BATCH_SIZE = 200
+FETCH_CONCURRENCY = 8
+REQUESTS_PER_SECOND = 2.0
+
+STORED_HASHES_QUERY = """
+    SELECT app_id, content_hashes, detailed_description, about_the_game, short_description, tags, genres, categories
+    FROM games WHERE app_id = ANY(%s);
+"""
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Refresh'
+    os.makedirs(log_dir, exist_ok = True)
+    log_file_path = os.path.join(log_dir, f"refresh_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
+    handler = logging.FileHandler(log_file_path, encoding = 'utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger = logging.getLogger(__name__)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    download_logger = logging.getLogger('download_logger')
+    if not download_logger.handlers:
+        download_logger.addHandler(handler)
+        download_logger.setLevel(logging.INFO)
+        download_logger.propagate = False
+    return logger
+
+refresh_logger = setup_logger()
+
+def backfilled_hashes(detailed_description, about_the_game, short_description, tags, genres, categories):
+    hashes = content_hashes({
+        "Detailed Description": detailed_description,
+        "About the Game": about_the_game,
+        "Short Description": short_description,
+        "Tags": tags,
+        "Genres": genres,
+        "Categories": categories
+    })
+    return {group: hashes[group] for group in TEXT_VECTOR_GROUPS}
+
+def load_stored_hashes(app_ids):
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(STORED_HASHES_QUERY, (list(app_ids),))
+        rows = cursor.fetchall()
+        connection.rollback()
+    finally:
+        return_connection(connection)
+
+    return {app_id: hashes if hashes else backfilled_hashes(*columns) for app_id, hashes, *columns in rows}
+
+def iter_catalog_app_ids(batch_size = REFRESH_BATCH_SIZE):
+    last_app_id = -1
+    while True:
+        connection = get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT app_id FROM games WHERE app_id > %s ORDER BY app_id LIMIT %s;", (last_app_id, batch_size))
+            app_ids = [row[0] for row in cursor.fetchall()]
+            connection.rollback()
+        finally:
+            return_connection(connection)
+        if not app_ids:
+            return
+        yield app_ids
+        last_app_id = app_ids[-1]
+
+def iter_app_id_batches(app_ids, batch_size = REFRESH_BATCH_SIZE):
+    app_ids = list(app_ids)
+    for start in range(0, len(app_ids), batch_size):
+        yield app_ids[start:start + batch_size]
+
+async def fetch_games(app_ids, concurrency = FETCH_CONCURRENCY, requests_per_second = REQUESTS_PER_SECOND):
+    games = []
+    async for app_id, details, tags in iter_app_data(app_ids, concurrency = concurrency, requests_per_second = requests_per_second):
+        try:
+            game = build_game_details(app_id, details, tags)
+        except Exception as e:
+            refresh_logger.error(f"Failed to process app_id: {app_id} - {e}")
+            continue
+        if game:
+            games.append(game)
+    return games
+
+def refresh_batch(app_ids, vocabulary, stats, concurrency = FETCH_CONCURRENCY, requests_per_second = REQUESTS_PER_SECOND):
+    games = asyncio.run(fetch_games(app_ids, concurrency, requests_per_second))
+    stored = load_stored_hashes([game['App ID'] for game in games])
+
+    to_process = []
+    groups_per_game = []
+    for game in games:
+        groups = changed_groups(stored.get(game['App ID']), content_hashes(game))
+        if not groups:
+            stats["unchanged"] += 1
+            continue
+        to_process.append(game)
+        groups_per_game.append(groups)
+        for group in groups:
+            stats["groups"][group] = stats["groups"].get(group, 0) + 1
+        stats["texts_encoded"] += sum(1 for group in TEXT_VECTOR_GROUPS if group in groups)
+
+    stats["fetched"] += len(games)
+    stats["skipped"] += len(app_ids) - len(games)
+    if not to_process:
+        return
+
+    processed_games = game_data_to_vector_changed(to_process, groups_per_game, vocabulary)
+    vocabulary.save_if_changed()
+
+    new_games = [game for game in processed_games if game['App ID'] not in stored]
+    changes = [
+        (game, changed_columns(groups))
+        for game, groups in zip(processed_games, groups_per_game)
+        if game['App ID'] in stored
+    ]
+
+    if new_games:
+        success_count, error_count = insert_data_bulk(new_games, on_conflict = "update", silent = True)
+        stats["inserted"] += success_count
+        stats["errors"] += error_count
+    if changes:
+        success_count, error_count = update_changed_columns(changes, silent = True)
+        stats["updated"] += success_count
+        stats["errors"] += error_count
+
+    revectorized = [game['App ID'] for game, groups in zip(processed_games, groups_per_game) if any(group in groups for group in TEXT_VECTOR_GROUPS)]
+    try:
+        stats["neighbors"] += update_game_neighbors(revectorized)
+    except Exception as e:
+        refresh_logger.error(f"Failed to update neighbours for {len(revectorized)} games - {e}")
+
+def refresh_games(app_ids = None, batch_size = REFRESH_BATCH_SIZE, concurrency = FETCH_CONCURRENCY, requests_per_second = REQUESTS_PER_SECOND):
+    create_connection_pool(minconn = 1, maxconn = 2)
+    stats = {"fetched": 0, "skipped": 0, "unchanged": 0, "inserted": 0, "updated": 0, "errors": 0, "texts_encoded": 0, "neighbors": 0, "groups": {}}
+
+    try:
+        vocabulary = load_feature_vocabulary()
+        batches = iter_app_id_batches(app_ids, batch_size) if app_ids is not None else iter_catalog_app_ids(batch_size)
+        refresh_logger.info("Started change-detection refresh of the games catalog.")
+
+        for batch in batches:
+            refresh_batch(batch, vocabulary, stats, concurrency, requests_per_second)
+            refresh_logger.info(f"Refreshed {stats['fetched']} games so far: {stats}")
+
+        texts_possible = stats["fetched"] * len(TEXT_VECTOR_GROUPS)
+        refresh_logger.info(f"Refresh finished: {stats}. Re-embedded {stats['texts_encoded']} of {texts_possible} texts. Embedding cache: {embedding_cache_stats()}")
+
+        if app_ids is None:
+            refresh_logger.info("Rebuilding game neighbours after the full catalog refresh.")
+            refresh_game_neighbors()
+    finally:
+        close_connection_pool()
+
+    return stats
+
+if __name__ == "__main__":
+    refresh_games()
@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import gzip
+import logging
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.SteamApi.feature_vocabulary import load_feature_vocabulary
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files, iter_part_records
+from Scripts.SteamApi.vector_store import VECTOR_FIELDS, split_vectors, append_vectors, remove_vector_store
+from Scripts.SteamApi.game_data_to_vector import game_data_to_vector_batch, embedding_cache_stats, EMBEDDING_BATCH_SIZE
+
+OUTPUT_DIR = "Data/GamesDataRevectorized"
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Vectorize'
+    os.makedirs(log_dir, exist_ok = True)
+    log_file_path = os.path.join(log_dir, f"revectorize_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
+    logger = logging.getLogger(__name__)
+    handler = logging.FileHandler(log_file_path, encoding = 'utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+revectorize_logger = setup_logger()
+
+def strip_vectors(game):
+    return {key: value for key, value in game.items() if key not in VECTOR_FIELDS and key != "Release Date Days"}
+
+def write_records(output_file, output_path, games):
+    app_ids = []
+    vectors = []
+    for game in games:
+        metadata, game_vectors = split_vectors(game)
+        output_file.write(json.dumps(metadata, ensure_ascii = False) + "\n")
+        app_ids.append(game.get("App ID"))
+        vectors.append(game_vectors)
+    append_vectors(output_path, app_ids, vectors)
+
+def revectorize_part(path, output_dir, vocabulary, batch_size, num_threads):
+    output_path = os.path.join(output_dir, os.path.basename(path))
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    remove_vector_store(output_path)
+
+    with opener(output_path, "wt", encoding = "utf-8") as output_file:
+        batch = []
+        for game in iter_part_records(path):
+            batch.append(strip_vectors(game))
+            if len(batch) >= batch_size:
+                write_records(output_file, output_path, game_data_to_vector_batch(batch, vocabulary, batch_size = batch_size, num_threads = num_threads))
+                count += len(batch)
+                batch = []
+        if batch:
+            write_records(output_file, output_path, game_data_to_vector_batch(batch, vocabulary, batch_size = batch_size, num_threads = num_threads))
+            count += len(batch)
+
+    return output_path, count
+
+def revectorize_games(input_dir = DATA_DIR, output_dir = OUTPUT_DIR, batch_size = EMBEDDING_BATCH_SIZE, num_threads = None):
+    os.makedirs(output_dir, exist_ok = True)
+    part_files = list_part_files(input_dir)
+    if not part_files:
+        revectorize_logger.warning(f"No part files found in {input_dir}.")
+        return
+
+    vocabulary = load_feature_vocabulary()
+    for path in part_files:
+        vocabulary.update_from_games(iter_part_records(path))
+    vocabulary.save_if_changed()
+    revectorize_logger.info(f"Re-vectorizing {len(part_files)} parts with vocabulary version {vocabulary.version} ({len(vocabulary.tags)} tags, {len(vocabulary.genres)} genres).")
+
+    total = 0
+    for path in part_files:
+        output_path, count = revectorize_part(path, output_dir, vocabulary, batch_size, num_threads)
+        total += count
+        revectorize_logger.info(f"Re-vectorized {count} games from {path} into {output_path}.")
+
+    revectorize_logger.info(f"Finished re-vectorizing {total} games.")
+    revectorize_logger.info(f"Embedding cache stats: {embedding_cache_stats()}")
+    revectorize_logger.info("------------End of re-vectorize session------------\n")
+
+revectorize_games()
@@ -0,0 +1,32 @@
+import os
+import sys
+import logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from Scripts.SteamApi.game_parts import DATA_DIR, list_part_files
+from Scripts.SteamApi.vector_store import convert_part, vectors_path
+
+def setup_logger():
+    log_dir = '../GameRecommendation/Logs/Vectorize'
+    os.makedirs(log_dir, exist_ok = True)
+    logger = logging.getLogger(__name__)
+    handler = logging.FileHandler(os.path.join(log_dir, 'split_part_vectors.log'), encoding = 'utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+split_logger = setup_logger()
+
+def split_part_vectors(directory = DATA_DIR):
+    for path in list_part_files(directory):
+        size_before = os.path.getsize(path)
+        count = convert_part(path)
+        if count == 0:
+            split_logger.info(f"Skipping {path}, vector store already present or part is empty.")
+            continue
+        size_after = os.path.getsize(path) + os.path.getsize(vectors_path(path))
+        split_logger.info(f"Moved vectors of {count} games out of {path}: {size_before} bytes -> {size_after} bytes.")
+
+split_part_vectors()
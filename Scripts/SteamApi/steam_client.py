@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36"
+HTTP_CACHE_DIR = '../GameRecommendation/Data/HttpCache'
+
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+download_logger = logging.getLogger('download_logger')
+
+class JitteredRetry(Retry):
+    def get_backoff_time(self):
+        return super().get_backoff_time() * random.uniform(0.5, 1.5)
+
+def build_retry(max_retries = MAX_RETRIES, backoff_factor = BACKOFF_FACTOR):
+    return JitteredRetry(
+        total = max_retries,
+        connect = max_retries,
+        read = max_retries,
+        status = max_retries,
+        status_forcelist = RETRY_STATUSES,
+        allowed_methods = frozenset(["GET"]),
+        backoff_factor = backoff_factor,
+        respect_retry_after_header = True,
+        raise_on_status = False
+    )
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.statuses = {}
+
+    def record(self, latency, status = None, retries = 0):
+        self.requests += 1
+        self.retries += retries
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if status is None or status >= 400:
+            self.errors += 1
+        if status == 304:
+            self.not_modified += 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "average_latency_ms": self.total_latency / self.requests * 1000 if self.requests else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+            "statuses": dict(self.statuses)
+        }
+
+def cached_response(url, body, encoding, headers):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = encoding
+    response.headers.update(headers)
+    return response
+
+class SteamClient:
+    def __init__(self, pool_connections = POOL_CONNECTIONS, pool_maxsize = POOL_MAXSIZE, timeout = (CONNECT_TIMEOUT, READ_TIMEOUT), max_retries = MAX_RETRIES, cache_dir = HTTP_CACHE_DIR):
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections = pool_connections, pool_maxsize = pool_maxsize, max_retries = build_retry(max_retries), pool_block = True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def cache_paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json"), os.path.join(self.cache_dir, key + ".body")
+
+    def load_validators(self, url):
+        meta_path, body_path = self.cache_paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        with open(meta_path, 'r', encoding = 'utf-8') as f:
+            return json.load(f)
+
+    def save_validators(self, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+
+        os.makedirs(self.cache_dir, exist_ok = True)
+        meta_path, body_path = self.cache_paths(url)
+        with open(body_path + ".tmp", 'wb') as f:
+            f.write(response.content)
+        os.replace(body_path + ".tmp", body_path)
+        with open(meta_path, 'w', encoding = 'utf-8') as f:
+            json.dump({
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "encoding": response.encoding,
+                "content_type": response.headers.get("Content-Type")
+            }, f)
+
+    def record(self, endpoint, latency, status = None, retries = 0):
+        with self.lock:
+            self.metrics.setdefault(endpoint, EndpointMetrics()).record(latency, status, retries)
+
+    def get(self, url, endpoint = "default", headers = None, conditional = False, stream = False):
+        headers = dict(headers or {})
+        validators = self.load_validators(url) if conditional else None
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers = headers, timeout = self.timeout, stream = stream)
+        except requests.RequestException:
+            self.record(endpoint, time.perf_counter() - start)
+            raise
+
+        retries = response.raw.retries
+        self.record(endpoint, time.perf_counter() - start, response.status_code, len(retries.history) if retries else 0)
+
+        if response.status_code == 304 and validators:
+            with open(self.cache_paths(url)[1], 'rb') as f:
+                body = f.read()
+            download_logger.info(f"Not modified since last fetch: {url}")
+            return cached_response(url, body, validators.get("encoding"), {"Content-Type": validators.get("content_type") or ""})
+
+        if conditional and response.status_code == 200:
+            self.save_validators(url, response)
+        return response
+
+    def get_json(self, url, endpoint = "default", conditional = False):
+        response = self.get(url, endpoint, conditional = conditional)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self):
+        with self.lock:
+            return {endpoint: metrics.summary() for endpoint, metrics in self.metrics.items()}
+
+    def close(self):
+        self.session.close()
+
+steam_client = None
+steam_client_lock = threading.Lock()
+
+def get_steam_client():
+    global steam_client
+    with steam_client_lock:
+        if steam_client is None:
+            steam_client = SteamClient()
+        return steam_client
@@ -0,0 +1,286 @@
+import re
+import html
+import time
+import codecs
+import random
+import asyncio
+import logging
+import aiohttp
+from bs4 import BeautifulSoup
+
+from Scripts.SteamApi.steam_client import USER_AGENT, get_steam_client
+
+STORE_API_BASE_URL = 'http://store.steampowered.com'
+STORE_PAGE_BASE_URL = 'https://store.steampowered.com'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+MIN_RATE_FACTOR = 0.1
+REQUEST_TIMEOUT = 30
+STREAM_CHUNK_SIZE = 16384
+
+TAG_BLOCK_MARKER = 'class="glance_tags popular_tags"'
+TAG_BLOCK_END = re.compile(r'\s*</div>')
+TAG_ELEMENT = re.compile(r'\s*<(a|div)\b([^>]*)>(.*?)</\1>', re.DOTALL)
+CLASS_ATTRIBUTE = re.compile(r'\bclass\s*=\s*"([^"]*)"')
+INNER_TAGS = re.compile(r'<[^>]+>')
+
+download_logger = logging.getLogger('download_logger')
+error_logger = logging.getLogger('error_logger')
+
+def app_details_url(app_id, base_url = STORE_API_BASE_URL):
+    return f'{base_url}/api/appdetails?appids={app_id}&l=english'
+
+def store_page_url(app_id, base_url = STORE_PAGE_BASE_URL):
+    return f"{base_url}/app/{app_id}/?l=english"
+
+def extract_app_details(app_id, app_data):
+    try:
+        if app_data[str(app_id)]['success']:
+            return app_data[str(app_id)]['data']
+        else:
+            return None
+    except TypeError as e:
+        if "'NoneType' object is not subscriptable" in str(e):
+            error_logger.error(f'Error while fetching data for app_id: {app_id} - {e}')
+            download_logger.info(f'Error for app_id: {app_id} has been logged in error_id.log')
+        else:
+            download_logger.error(f'Error while fetching data for app_id: {app_id} - {e}')
+        return None
+
+def scan_tag_block(page, start = 0):
+    block_start = page.find(TAG_BLOCK_MARKER, start)
+    if block_start == -1:
+        return None
+    position = page.find('>', block_start)
+    if position == -1:
+        return None
+    position += 1
+
+    tags = []
+    while not TAG_BLOCK_END.match(page, position):
+        element = TAG_ELEMENT.match(page, position)
+        if not element:
+            return None
+        class_attribute = CLASS_ATTRIBUTE.search(element.group(2))
+        if not class_attribute or 'app_tag' not in class_attribute.group(1).split():
+            return None
+        tags.append(html.unescape(INNER_TAGS.sub('', element.group(3))).strip())
+        position = element.end()
+    return tags
+
+def parse_steam_tags_full(page):
+    soup = BeautifulSoup(page, 'html.parser')
+    return [tag.text.strip() for tag in soup.select('.app_tag')]
+
+def finish_steam_tags(tags):
+    if tags and tags[-1] == '+':
+        tags.pop()
+
+    return tags if tags else ["No tags for game"]
+
+def parse_steam_tags(page):
+    tags = scan_tag_block(page)
+    if tags is None:
+        tags = parse_steam_tags_full(page)
+    return finish_steam_tags(tags)
+
+class TagBlockReader:
+    def __init__(self, encoding = None):
+        self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors = 'replace')
+        self.page = ''
+        self.block_start = -1
+        self.tags = None
+
+    def feed(self, chunk):
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+        search_from = max(0, len(self.page) - len(TAG_BLOCK_MARKER))
+        self.page += chunk
+
+        if self.block_start == -1:
+            self.block_start = self.page.find(TAG_BLOCK_MARKER, search_from)
+        if self.block_start != -1:
+            self.tags = scan_tag_block(self.page, self.block_start)
+        return self.tags is not None
+
+    def result(self):
+        if self.tags is None:
+            self.page += self.decoder.decode(b'', final = True)
+            self.tags = parse_steam_tags_full(self.page)
+        return finish_steam_tags(self.tags)
+
+def get_app_details(app_id, base_url = STORE_API_BASE_URL):
+    try:
+        response = get_steam_client().get(app_details_url(app_id, base_url), "appdetails")
+        return extract_app_details(app_id, response.json())
+    except Exception as e:
+        download_logger.error(f'Error while fetching data for app_id: {app_id} - {e}')
+        return None
+
+def get_steam_tags(app_id, base_url = STORE_PAGE_BASE_URL):
+    response = get_steam_client().get(store_page_url(app_id, base_url), "store_page", stream = True)
+
+    try:
+        if response.status_code == 200:
+            reader = TagBlockReader(response.encoding)
+            for chunk in response.iter_content(chunk_size = STREAM_CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+            return reader.result()
+        else:
+            download_logger.warning(f"Failed to access the Steam page for app_id: {app_id}. Status: {response.status_code}")
+            return ["No tags for game because of error"]
+    finally:
+        response.close()
+
+class TokenBucket:
+    def __init__(self, rate, capacity = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, pause):
+        self.refill()
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+        self.tokens = 0
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def reward(self):
+        if self.rate < self.base_rate:
+            self.refill()
+            self.rate = min(self.base_rate, self.rate + self.base_rate * MIN_RATE_FACTOR)
+
+def parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt):
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+async def read_tag_block(response):
+    reader = TagBlockReader(response.charset)
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        if reader.feed(chunk):
+            break
+    return reader
+
+async def fetch_with_backoff(session, bucket, url, app_id, headers = None, as_json = False, as_tags = False):
+    for attempt in range(MAX_RETRIES + 1):
+        await bucket.acquire()
+        try:
+            async with session.get(url, headers = headers) as response:
+                if response.status in RETRY_STATUSES:
+                    delay = parse_retry_after(response.headers.get('Retry-After')) or backoff_delay(attempt)
+                    bucket.penalize(delay)
+                    download_logger.warning(f"Status {response.status} for app_id: {app_id}. Backing off for {delay:.1f}s (attempt {attempt + 1}).")
+                    continue
+
+                bucket.reward()
+                if as_json:
+                    return response.status, await response.json(content_type = None)
+                if as_tags:
+                    return response.status, await read_tag_block(response)
+                return response.status, await response.text()
+        except ValueError as e:
+            download_logger.error(f"Invalid response body from {url} for app_id: {app_id} - {e}. Not retrying.")
+            return None, None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            delay = backoff_delay(attempt)
+            download_logger.warning(f"Request failed for app_id: {app_id} - {e}. Retrying in {delay:.1f}s (attempt {attempt + 1}).")
+            await asyncio.sleep(delay)
+
+    download_logger.error(f"Giving up on {url} for app_id: {app_id} after {MAX_RETRIES + 1} attempts.")
+    return None, None
+
+async def get_app_details_async(session, bucket, app_id, base_url = STORE_API_BASE_URL):
+    try:
+        status, app_data = await fetch_with_backoff(session, bucket, app_details_url(app_id, base_url), app_id, as_json = True)
+        if status is None:
+            error_logger.error(f'Error while fetching data for app_id: {app_id} - no valid response')
+            return None
+        return extract_app_details(app_id, app_data)
+    except Exception as e:
+        download_logger.error(f'Error while fetching data for app_id: {app_id} - {e}')
+        return None
+
+async def get_steam_tags_async(session, bucket, app_id, base_url = STORE_PAGE_BASE_URL):
+    headers = {"User-Agent": USER_AGENT}
+    try:
+        status, reader = await fetch_with_backoff(session, bucket, store_page_url(app_id, base_url), app_id, headers = headers, as_tags = True)
+        if status == 200:
+            return await asyncio.to_thread(reader.result)
+    except Exception as e:
+        download_logger.error(f"Error while parsing the Steam page for app_id: {app_id} - {e}")
+        status = None
+
+    download_logger.warning(f"Failed to access the Steam page for app_id: {app_id}. Status: {status}")
+    return ["No tags for game because of error"]
+
+async def fetch_app(session, bucket, app_id, api_base_url = STORE_API_BASE_URL, page_base_url = STORE_PAGE_BASE_URL):
+    details, tags = await asyncio.gather(
+        get_app_details_async(session, bucket, app_id, api_base_url),
+        get_steam_tags_async(session, bucket, app_id, page_base_url)
+    )
+    return app_id, details, tags
+
+async def iter_app_data(app_ids, concurrency = 8, requests_per_second = 2.0, api_base_url = STORE_API_BASE_URL, page_base_url = STORE_PAGE_BASE_URL):
+    bucket = TokenBucket(requests_per_second)
+    results = asyncio.Queue(maxsize = concurrency)
+    pending = iter(app_ids)
+    connector = aiohttp.TCPConnector(limit = concurrency * 2)
+    timeout = aiohttp.ClientTimeout(total = REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector = connector, timeout = timeout) as session:
+        errors = []
+
+        async def worker():
+            try:
+                for app_id in pending:
+                    await results.put(await fetch_app(session, bucket, app_id, api_base_url, page_base_url))
+            except Exception as e:
+                errors.append(e)
+            await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        finished = 0
+        try:
+            while finished < len(workers):
+                result = await results.get()
+                if result is None:
+                    finished += 1
+                    continue
+                yield result
+            if errors:
+                raise errors[0]
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions = True)
@@ -0,0 +1,20 @@
+import re
+
+TAG_PATTERN = re.compile(r'<[^>\n]*>')
+REMOVED_ENTITIES = ('&quot;', '&amp;', '&gt;', '&lt;')
+TEXT_FIELDS = ['Game Name', 'Detailed Description', 'Short Description', 'About the Game', 'Minimum Requirements', 'Recommended Requirements']
+
+def remove_html_tags(text):
+    if '<' in text:
+        text = TAG_PATTERN.sub(' ', text)
+    if '&' in text:
+        for entity in REMOVED_ENTITIES:
+            text = text.replace(entity, '')
+    return ' '.join(text.split())
+
+def clean_game_text(game):
+    for field in TEXT_FIELDS:
+        value = game.get(field)
+        if isinstance(value, str):
+            game[field] = remove_html_tags(value)
+    return game
@@ -1,20 +1,19 @@
 import os
 import sys
-import json
+import time
 import logging
-import requests
-import shutil
 from datetime import datetime, timedelta
 
+from download_queue import DownloadQueue
+from Scripts.SteamApi.app_list_store import AppListStore
+from Scripts.SteamApi.app_name_index import build_app_name_index, INDEX_PATH as APP_NAME_INDEX_PATH
+from Scripts.SteamApi.steam_client import get_steam_client
+
 sys.stdout.reconfigure(encoding = 'utf-8', errors = 'replace')
 
 base_path = '../GameRecommendation'
-data_list_path = '/Data'
 log_update_path = '/Logs/Update'
 
-base_file_path = base_path + data_list_path + '/BaseList/steam_game_list_base.json'
-removed_file_path = base_path + data_list_path + '/BaseList/steam_game_list_removed.json'
-update_file_path = base_path + data_list_path + '/DownloadList/steam_game_list_to_update.json'
 last_update_file_path = base_path + log_update_path + '/last_database_update.txt'
 
 log_file_path = base_path + log_update_path + '/steam_game_updater.log'
@@ -45,99 +44,59 @@ def should_update_database(hours = 24):
 
 def fetch_steam_game_data():
     url = 'https://api.steampowered.com/ISteamApps/GetAppList/v2/'
-    response = requests.get(url)
+    response = get_steam_client().get(url, "app_list", conditional = True)
     if response.status_code == 200:
-        return [{"appid": game["appid"], "name": game["name"]} for game in response.json()['applist']['apps']]
+        return [(game["appid"], game["name"]) for game in response.json()['applist']['apps']]
     else:
         logger.error(f"Error fetching data from Steam API: {response.status_code}")
         raise Exception(f"Error fetching data from Steam API: {response.status_code}")
 
-def save_to_json(data, file_path):
-    with open(file_path, 'w', encoding = 'utf-8') as f:
-        json.dump(data, f, indent = 4, ensure_ascii = False)
-    logger.info(f"Data saved to {file_path}")
-
-def compare_game_lists(base_data, new_data):
-    base_ids = {game['appid'] for game in base_data}
-    new_ids = {game['appid'] for game in new_data}
-    missing_games = [g for g in new_data if g['appid'] not in base_ids]
-    removed_games = [g for g in base_data if g['appid'] not in new_ids]
-    return missing_games, removed_games
-
-def backup_base_file():
-    if os.path.exists(base_file_path):
-        backup_path = base_file_path.replace(".json", "_backup.json")
-        shutil.copy(base_file_path, backup_path)
-        logger.info(f"Backup created at {backup_path}")
-
-def delete_duplicates():
-    try:
-        with open(update_file_path, 'r', encoding = 'utf-8') as f:
-            data = json.load(f)
-        seen = set()
-        unique_data = []
-        for entry in data:
-            entry_str = json.dumps(entry, sort_keys = True)
-            if entry_str not in seen:
-                seen.add(entry_str)
-                unique_data.append(entry)
-        with open(update_file_path, 'w', encoding = 'utf-8') as f:
-            json.dump(unique_data, f, indent = 4, ensure_ascii = False)
-        logger.info(f"Removed duplicates. Unique entries: {len(unique_data)}")
-    except Exception as e:
-        logger.error(f"Error removing duplicates: {e}")
-
-def update_game_list():
+def update_game_list(work_queue = None):
     if not should_update_database():
         logger.info("Game list update not required yet.")
         return
 
     logger.info("Starting safe update of the game list...")
+    store = AppListStore()
     try:
-        new_data = fetch_steam_game_data()
+        migrated = store.migrate_legacy_base_list()
+        if migrated:
+            logger.info(f"Imported {migrated} app ids from the legacy base list.")
 
-        if os.path.exists(base_file_path):
-            with open(base_file_path, 'r', encoding = 'utf-8') as f:
-                base_data = json.load(f)
-        else:
-            base_data = []
+        new_data = fetch_steam_game_data()
 
-        if len(new_data) < 0.6 * len(base_data):
+        if len(new_data) < 0.6 * store.count():
             logger.warning("New data looks suspiciously short. Aborting update.")
             return
 
-        missing_games, removed_games = compare_game_lists(base_data, new_data)
+        start_time = time.perf_counter()
+        diff = store.sync(new_data)
+        logger.info(f"App list diff computed in {time.perf_counter() - start_time:.2f}s: {diff}")
 
-        if not missing_games:
+        if not diff["added"]:
             logger.info("No new games found.")
         else:
-            logger.info(f"New games: {len(missing_games)}")
-
-        if removed_games:
-            save_to_json(removed_games, removed_file_path)
-            logger.info(f"Removed games saved to: {removed_file_path}")
-
-        if os.path.exists(update_file_path):
-            with open(update_file_path, 'r', encoding = 'utf-8') as f:
-                current_update_data = json.load(f)
-        else:
-            current_update_data = []
+            logger.info(f"New games: {diff['added']}")
 
-        current_ids = {g['appid'] for g in current_update_data}
-        new_unique_games = [g for g in missing_games if g['appid'] not in current_ids]
+        if diff["removed"]:
+            logger.info(f"Removed games recorded in sync {diff['sync_id']} of {store.path}")
 
-        current_update_data.extend(new_unique_games)
-        save_to_json(current_update_data, update_file_path)
-        logger.info(f"Appended {len(new_unique_games)} new unique games to update list.")
+        queue = work_queue or DownloadQueue()
+        try:
+            new_unique_games = queue.enqueue_many(store.changes(diff["sync_id"], "added"))
+        finally:
+            if work_queue is None:
+                queue.close()
+        logger.info(f"Enqueued {new_unique_games} new unique games for download.")
 
-        delete_duplicates()
-        save_to_json(new_data, base_file_path)
-        backup_base_file()
+        if diff["added"] or diff["removed"] or diff["renamed"] or not os.path.exists(APP_NAME_INDEX_PATH):
+            indexed_names = build_app_name_index(store.iter_apps())
+            logger.info(f"App name index rebuilt with {indexed_names} entries.")
 
         with open(last_update_file_path, 'a', encoding = 'utf-8') as f:
             f.write(f"Last Update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Elements Added: {len(new_unique_games)}\n")
-            f.write(f"Removed App IDs: {len(removed_games)}\n")
+            f.write(f"Elements Added: {new_unique_games}\n")
+            f.write(f"Removed App IDs: {diff['removed']}\n")
             f.write("------------End of update------------\n\n")
 
         logger.info("Update completed successfully.\n")
@@ -145,3 +104,5 @@ def update_game_list():
 
     except Exception as e:
         logger.error(f"Update failed: {e}")
+    finally:
+        store.close()
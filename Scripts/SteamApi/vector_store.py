@@ -0,0 +1,134 @@
+import os
+import gzip
+import json
+import numpy as np
+
+from Scripts.SteamApi.game_parts import iter_part_records
+
+VECTOR_SIZE = 768
+VECTOR_FIELDS = ["Features", "Detailed Description Vector", "About the Game Vector", "Short Description Vector", "Metadata Vector"]
+VECTOR_DTYPE = np.float16
+ID_DTYPE = np.int64
+CONVERT_CHUNK_SIZE = 500
+VECTOR_EXTENSIONS = {np.dtype(np.float16): ".f16", np.dtype(np.float32): ".f32"}
+
+def part_stem(part_path):
+    for extension in (".jsonl", ".gz"):
+        if part_path.endswith(extension):
+            return part_path[:-len(extension)]
+    return part_path
+
+def ids_path(part_path):
+    return part_stem(part_path) + ".ids"
+
+def vectors_path(part_path, dtype = VECTOR_DTYPE):
+    return part_stem(part_path) + VECTOR_EXTENSIONS[np.dtype(dtype)]
+
+def find_vectors_file(part_path):
+    for dtype, extension in VECTOR_EXTENSIONS.items():
+        path = part_stem(part_path) + extension
+        if os.path.exists(path):
+            return path, dtype
+    return None, None
+
+def has_vector_store(part_path):
+    return os.path.exists(ids_path(part_path)) and find_vectors_file(part_path)[0] is not None
+
+def vectors_to_array(game, dtype = VECTOR_DTYPE):
+    array = np.zeros((len(VECTOR_FIELDS), VECTOR_SIZE), dtype = dtype)
+    for row, field in enumerate(VECTOR_FIELDS):
+        vector = game.get(field)
+        if vector is not None and len(vector):
+            vector = np.asarray(vector, dtype = np.float32)[:VECTOR_SIZE]
+            array[row, :len(vector)] = vector
+    return array
+
+def split_vectors(game, dtype = VECTOR_DTYPE):
+    metadata = {key: value for key, value in game.items() if key not in VECTOR_FIELDS}
+    return metadata, vectors_to_array(game, dtype)
+
+def append_vectors(part_path, app_ids, vectors, dtype = VECTOR_DTYPE):
+    with open(vectors_path(part_path, dtype), "ab") as f:
+        f.write(np.ascontiguousarray(vectors, dtype = dtype).tobytes())
+    with open(ids_path(part_path), "ab") as f:
+        f.write(np.asarray(app_ids, dtype = ID_DTYPE).tobytes())
+
+def load_part_vectors(part_path):
+    path, dtype = find_vectors_file(part_path)
+    if path is None or not os.path.exists(ids_path(part_path)):
+        return None, None
+
+    app_ids = np.fromfile(ids_path(part_path), dtype = ID_DTYPE)
+    rows = os.path.getsize(path) // (np.dtype(dtype).itemsize * len(VECTOR_FIELDS) * VECTOR_SIZE)
+    rows = min(rows, len(app_ids))
+    if rows == 0:
+        return app_ids[:0], np.zeros((0, len(VECTOR_FIELDS), VECTOR_SIZE), dtype = dtype)
+
+    vectors = np.memmap(path, dtype = dtype, mode = "r", shape = (rows, len(VECTOR_FIELDS), VECTOR_SIZE))
+    return app_ids[:rows], vectors
+
+def app_id_rows(app_ids):
+    return {int(app_id): row for row, app_id in enumerate(app_ids)}
+
+def attach_vectors(game, vectors):
+    for row, field in enumerate(VECTOR_FIELDS):
+        game[field] = np.array(vectors[row], dtype = np.float32)
+    return game
+
+def iter_games_with_vectors(part_path):
+    app_ids, vectors = load_part_vectors(part_path)
+    rows = app_id_rows(app_ids) if app_ids is not None else {}
+
+    for game in iter_part_records(part_path):
+        row = rows.get(game.get("App ID"))
+        if row is not None and VECTOR_FIELDS[1] not in game:
+            attach_vectors(game, vectors[row])
+        yield game
+
+def merge_vector_stores(part_paths, merged_part_path):
+    merged_vectors_path = None
+    for part_path in part_paths:
+        app_ids, vectors = load_part_vectors(part_path)
+        if app_ids is None:
+            continue
+        if part_stem(part_path) != part_stem(merged_part_path):
+            append_vectors(merged_part_path, app_ids, vectors, vectors.dtype)
+        merged_vectors_path = vectors_path(merged_part_path, vectors.dtype)
+
+    for part_path in part_paths:
+        if part_stem(part_path) != part_stem(merged_part_path):
+            remove_vector_store(part_path)
+    return merged_vectors_path
+
+def remove_vector_store(part_path):
+    for path in [ids_path(part_path)] + [part_stem(part_path) + extension for extension in VECTOR_EXTENSIONS.values()]:
+        if os.path.exists(path):
+            os.remove(path)
+
+def convert_part(part_path, dtype = VECTOR_DTYPE):
+    if has_vector_store(part_path):
+        return 0
+
+    temp_path = part_path + ".tmp"
+    opener = gzip.open if part_path.endswith(".gz") else open
+    count = 0
+    app_ids = []
+    vectors = []
+
+    with opener(temp_path, "wt", encoding = "utf-8") as output_file:
+        for game in iter_part_records(part_path):
+            metadata, game_vectors = split_vectors(game, dtype)
+            output_file.write(json.dumps(metadata, ensure_ascii = False) + "\n")
+            app_ids.append(game.get("App ID"))
+            vectors.append(game_vectors)
+            if len(vectors) >= CONVERT_CHUNK_SIZE:
+                append_vectors(part_path, app_ids, np.stack(vectors), dtype)
+                count += len(app_ids)
+                app_ids = []
+                vectors = []
+
+    if vectors:
+        append_vectors(part_path, app_ids, np.stack(vectors), dtype)
+        count += len(app_ids)
+    os.replace(temp_path, part_path)
+    return count